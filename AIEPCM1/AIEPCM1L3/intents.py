@@ -0,0 +1,78 @@
+from collections import deque
+
+# ---------------- Keyword Automaton ----------------
+# Aho-Corasick: a trie of every keyword plus failure links, so one pass over
+# the input finds all keywords it contains, however many there are.
+# State 0 is the root; goto[s] maps a character to the next state, fail[s] is
+# the longest proper suffix that is also a trie path, and out[s] lists the
+# values of every keyword ending at s (its own and those reached by fail links).
+class Automaton:
+    __slots__ = ("goto", "fail", "out")
+
+    def __init__(self, keywords):
+        self.goto, self.fail, self.out = [{}], [0], [[]]
+        for keyword, value in keywords:
+            state = 0
+            for ch in keyword:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append((keyword, value))
+
+        # Breadth-first, so a state's failure link is final before its children need it
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    # Yield (end index, keyword, value) for every occurrence, overlaps included
+    def find_all(self, text):
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for keyword, value in out[state]:
+                yield i, keyword, value
+
+
+# ---------------- Intents ----------------
+# An intent is a dict: name, keywords, synonyms, priority and handler.
+# Keywords match as plain substrings of the normalized input, exactly like
+# `"pack" in user_input`. Synonyms must be whole words, so "quit" does not
+# fire on "quite". When several intents match, the one with the highest
+# priority wins and ties go to the earliest in the table.
+def compile_intents(intents):
+    keywords = []
+    for order, intent in enumerate(intents):
+        for phrase in intent["keywords"]:
+            keywords.append((phrase, (-intent["priority"], order, False)))
+        for phrase in intent.get("synonyms", []):
+            keywords.append((phrase, (-intent["priority"], order, True)))
+    return Automaton(keywords), list(intents)
+
+
+# True when the match ending at `end` is not glued to letters on either side
+def _whole_word(text, end, keyword):
+    start = end - len(keyword) + 1
+    return ((start == 0 or not text[start - 1].isalpha()) and
+            (end + 1 == len(text) or not text[end + 1].isalpha()))
+
+
+def match_intent(compiled, text):
+    automaton, intents = compiled
+    best = min((value for end, keyword, value in automaton.find_all(text)
+                if not value[2] or _whole_word(text, end, keyword)), default=None)
+    return None if best is None else intents[best[1]]
@@ -0,0 +1,271 @@
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import tracemalloc
+from collections import OrderedDict
+
+from intents import compile_intents, match_intent
+
+# Destination & joke data
+destinations = {
+    "beaches": ["Bali", "Maldives", "Phuket"],
+    "mountains": ["Swiss Alps", "Rocky Mountains", "Himalayas"],
+    "cities": ["Tokyo", "Paris", "New York"]
+}
+
+jokes = [
+    "Why don't programmers like nature? Too many bugs!",
+    "Why did the computer go to the doctor? Because it had a virus!",
+    "Why do travelers always feel warm? Because of all their hot spots!"
+]
+
+HELP = ("I can:\n"
+        "- Suggest travel spots (say 'recommend')\n"
+        "- Offer packing tips (say 'packing')\n"
+        "- Tell a joke (say 'joke')\n"
+        "- Type 'exit' or 'bye' to end.")
+
+GREETING = "Hello! I'm TravelBot.\nYour name?"
+ASK_PREFERENCE = "Beaches, mountains, or cities?"
+
+
+# Helper function to normalize user input (remove extra spaces, make lowercase)
+def normalize_input(text):
+    return re.sub(r"\s+", " ", text.strip().lower())
+
+
+# ---------------- Session ----------------
+# Everything a conversation needs between two messages. `state` names the
+# question the bot is waiting on; `choice` holds the suggestion or location
+# it will need for the next reply.
+class Session:
+    __slots__ = ("state", "name", "choice")
+
+    def __init__(self):
+        self.state = "name"
+        self.name = ""
+        self.choice = None
+
+
+# Bounded store: the least recently active conversation is dropped when full
+class SessionStore:
+    def __init__(self, max_sessions=100_000):
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()
+        self.evicted = 0
+
+    def get(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = Session()
+            if len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+                self.evicted += 1
+        else:
+            self.sessions.move_to_end(session_id)
+        return session
+
+    def drop(self, session_id):
+        self.sessions.pop(session_id, None)
+
+    def __len__(self):
+        return len(self.sessions)
+
+
+# ---------------- Intent Handlers ----------------
+# Each takes the session, may move it to a new state, and returns the reply
+def start_recommend(session):
+    session.state = "preference"
+    return ASK_PREFERENCE
+
+
+def start_packing(session):
+    session.state = "location"
+    return "Where to?"
+
+
+def tell_joke(session):
+    return random.choice(jokes)
+
+
+def show_help(session):
+    return HELP
+
+
+def say_goodbye(session):
+    session.state = "done"
+    return "Safe travels! Goodbye!"
+
+
+# Intent table: any keyword or synonym found in the input selects the intent,
+# the highest priority wins when several match
+intents = [
+    {"name": "recommend", "keywords": ["recommend", "suggest"],
+     "synonyms": ["destination", "where should i go", "trip idea"], "priority": 50, "handler": start_recommend},
+    {"name": "packing", "keywords": ["pack", "packing"],
+     "synonyms": ["luggage", "what to bring"], "priority": 40, "handler": start_packing},
+    {"name": "joke", "keywords": ["joke", "funny"],
+     "synonyms": ["make me laugh"], "priority": 30, "handler": tell_joke},
+    {"name": "help", "keywords": ["help"],
+     "synonyms": ["what can you do"], "priority": 20, "handler": show_help},
+    {"name": "exit", "keywords": ["exit", "bye"],
+     "synonyms": ["quit", "see you"], "priority": 10, "handler": say_goodbye},
+]
+compiled_intents = compile_intents(intents)
+
+
+# ---------------- State Machine ----------------
+def on_name(session, message):
+    session.name = message.strip()
+    session.state = "idle"
+    return f"Nice to meet you, {session.name}!\n{HELP}"
+
+
+def on_idle(session, message):
+    intent = match_intent(compiled_intents, normalize_input(message))
+    if intent is None:
+        return "Could you rephrase?"
+    return intent["handler"](session)
+
+
+def on_preference(session, message):
+    preference = normalize_input(message)
+    if preference not in destinations:
+        session.state = "idle"
+        return f"Sorry, I don't have that type of destination.\n{HELP}"
+    session.choice = random.choice(destinations[preference])
+    session.state = "confirm"
+    return f"How about {session.choice}?\nDo you like it? (yes/no)"
+
+
+# A "no" loops back to the preference question instead of recursing
+def on_confirm(session, message):
+    answer = normalize_input(message)
+    if answer == "yes":
+        session.state = "idle"
+        return f"Awesome! Enjoy {session.choice}!"
+    session.state = "preference"
+    if answer == "no":
+        return f"Let's try another.\n{ASK_PREFERENCE}"
+    return f"I'll suggest again.\n{ASK_PREFERENCE}"
+
+
+def on_location(session, message):
+    session.choice = normalize_input(message)
+    session.state = "days"
+    return "How many days?"
+
+
+def on_days(session, message):
+    session.state = "idle"
+    return (f"Packing tips for {message.strip()} days in {session.choice}:\n"
+            "- Pack versatile clothes.\n"
+            "- Bring chargers/adapters.\n"
+            "- Check the weather forecast.")
+
+
+# A finished conversation starts over
+def on_done(session, message):
+    session.__init__()
+    return GREETING
+
+
+STATES = {
+    "name": on_name,
+    "idle": on_idle,
+    "preference": on_preference,
+    "confirm": on_confirm,
+    "location": on_location,
+    "days": on_days,
+    "done": on_done,
+}
+
+
+def handle(session, message):
+    return STATES[session.state](session, message)
+
+
+# ---------------- Async Front End ----------------
+# JSON lines, so a chat gateway can multiplex any number of conversations
+# over one connection: {"session": id, "message": text} -> {"session": id, "reply": text}.
+# A session's first message gets the greeting back and is not interpreted.
+async def handle_connection(reader, writer, store):
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+                session_id, message = str(request["session"]), str(request.get("message", ""))
+            except (ValueError, KeyError, TypeError):
+                writer.write(b'{"error": "expected {\\"session\\": ..., \\"message\\": ...}"}\n')
+                continue
+            new = session_id not in store.sessions
+            session = store.get(session_id)
+            reply = GREETING if new else handle(session, message)
+            if session.state == "done":
+                store.drop(session_id)
+            writer.write(json.dumps({"session": session_id, "reply": reply}).encode("utf-8") + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host, port, max_sessions):
+    store = SessionStore(max_sessions)
+    server = await asyncio.start_server(lambda r, w: handle_connection(r, w, store), host, port)
+    print(f"TravelBot listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+# ---------------- Benchmark ----------------
+# Interleave many scripted conversations through one store: one message per
+# session per round, like a gateway would deliver them
+SCRIPT = ["Ann", "can you suggest something", "mountains", "no", "cities", "yes",
+          "help me pack", "Tokyo", "5", "tell me a joke", "bye"]
+
+
+def bench(conversations):
+    store = SessionStore(max_sessions=conversations)
+    tracemalloc.start()
+    start = time.perf_counter()
+    for session_id in range(conversations):
+        store.get(session_id)
+    for message in SCRIPT:
+        for session_id in range(conversations):
+            handle(store.get(session_id), message)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    messages = conversations * len(SCRIPT)
+    print(f"{conversations:,} concurrent conversations, {messages:,} messages in {elapsed:.2f}s "
+          f"({messages / elapsed:,.0f} messages/s)")
+    print(f"peak memory {peak / 1e6:.1f} MB ({peak / conversations:.0f} bytes per conversation)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TravelBot conversation server")
+    parser.add_argument("command", choices=["serve", "bench"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-sessions", type=int, default=100_000)
+    parser.add_argument("--conversations", type=int, default=50_000, help="sessions to simulate (bench)")
+    args = parser.parse_args()
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, args.max_sessions))
+        except KeyboardInterrupt:
+            pass
+    else:
+        bench(args.conversations)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
-import random
 from colorama import init, Fore, Style
+from bitboard import is_full, is_legal, is_win, to_board
+from tablebase import analyse, best_move, load_or_build, outcome, position_code
 init(autoreset=True)
 
+# Every position solved once (and cached in tablebase.bin): each AI move is a lookup
+table = load_or_build()
+
 # ---------------- Display Board ----------------
 def display_board(board):
     print()
@@ -30,53 +34,44 @@ def player_choice():
     else:
         return ('O', 'X')
 
+# ---------------- Hint ----------------
+def show_hint(player, ai):
+    results = analyse(table, player, ai)
+    best = outcome(table.score[position_code(player, ai)])
+    picks = [cell + 1 for cell, result in results.items() if result == best]
+    print(Fore.MAGENTA + f"Hint: play {', '.join(map(str, picks))} (best you can force: {best})")
+    for cell, result in sorted(results.items()):
+        print(Fore.MAGENTA + f"  {cell + 1}: {result}")
+
 # ---------------- Player Move ----------------
-def player_move(board, symbol):
+# The game state is two bitboards; returns the player's bits after the move
+def player_move(player, ai):
     move = -1
-    while move not in range(1, 10) or not board[move - 1].isdigit():
+    while not is_legal(player | ai, move - 1):
         try:
-            move = int(input("Enter your move (1-9): "))
-            if move not in range(1, 10) or not board[move - 1].isdigit():
+            choice = input("Enter your move (1-9, or 'h' for a hint): ").strip().lower()
+            if choice in ('h', 'hint'):
+                show_hint(player, ai)
+                continue
+            move = int(choice)
+            if not is_legal(player | ai, move - 1):
                 print("Invalid move. Please try again.")
         except ValueError:
             print("Please enter a number between 1 and 9.")
-    board[move - 1] = symbol
+    return player | 1 << (move - 1)
 
 # ---------------- AI Move ----------------
-def ai_move(board, ai_symbol, player_symbol):
-    for i in range(9):
-        if board[i].isdigit():
-            board_copy = board.copy()
-            board_copy[i] = ai_symbol
-            if check_win(board_copy, ai_symbol):
-                board[i] = ai_symbol
-                return
-    for i in range(9):
-        if board[i].isdigit():
-            board_copy = board.copy()
-            board_copy[i] = player_symbol
-            if check_win(board_copy, player_symbol):
-                board[i] = ai_symbol
-                return
-    possible_moves = [i for i in range(9) if board[i].isdigit()]
-    move = random.choice(possible_moves)
-    board[move] = ai_symbol
+# Perfect play: a random pick among the tablebase's optimal moves
+def ai_move(ai, player):
+    return ai | 1 << best_move(table, ai, player)
 
 # ---------------- Win Check ----------------
-def check_win(board, symbol):
-    win_conditions = [
-        (0, 1, 2), (3, 4, 5), (6, 7, 8),   # Horizontal
-        (0, 3, 6), (1, 4, 7), (2, 5, 8),   # Vertical
-        (0, 4, 8), (2, 4, 6)               # Diagonal
-    ]
-    for cond in win_conditions:
-        if board[cond[0]] == board[cond[1]] == board[cond[2]] == symbol:
-            return True
-    return False
+def check_win(bits):
+    return is_win(bits)
 
 # ---------------- Full Board Check ----------------
-def check_full(board):
-    return all(not spot.isdigit() for spot in board)
+def check_full(player, ai):
+    return is_full(player, ai)
 
 # ---------------- Main Game ----------------
 def tic_tac_toe():
@@ -84,35 +79,35 @@ def tic_tac_toe():
     player_name = input(Fore.GREEN + "Enter your name: " + Style.RESET_ALL)
 
     while True:
-        board = ['1', '2', '3', '4', '5', '6', '7', '8', '9']
+        player, ai = 0, 0
         player_symbol, ai_symbol = player_choice()
         turn = 'Player'
         game_on = True
 
         while game_on:
-            display_board(board)
+            display_board(to_board(player, ai, player_symbol, ai_symbol))
             if turn == 'Player':
-                player_move(board, player_symbol)
-                if check_win(board, player_symbol):
-                    display_board(board)
+                player = player_move(player, ai)
+                if check_win(player):
+                    display_board(to_board(player, ai, player_symbol, ai_symbol))
                     print(Fore.GREEN + f"Congratulations, {player_name}! You have won the game!")
                     game_on = False
                 else:
-                    if check_full(board):
-                        display_board(board)
+                    if check_full(player, ai):
+                        display_board(to_board(player, ai, player_symbol, ai_symbol))
                         print(Fore.YELLOW + "It's a tie!")
                         break
                     else:
                         turn = 'AI'
             else:
-                ai_move(board, ai_symbol, player_symbol)
-                if check_win(board, ai_symbol):
-                    display_board(board)
+                ai = ai_move(ai, player)
+                if check_win(ai):
+                    display_board(to_board(player, ai, player_symbol, ai_symbol))
                     print(Fore.RED + "AI has won the game!")
                     game_on = False
                 else:
-                    if check_full(board):
-                        display_board(board)
+                    if check_full(player, ai):
+                        display_board(to_board(player, ai, player_symbol, ai_symbol))
                         print(Fore.YELLOW + "It's a tie!")
                         break
                     else:
@@ -0,0 +1,60 @@
+# ---------------- Bitboard Engine ----------------
+# Each player's marks are one 9-bit int: bit i is set when cell i (0-8,
+# left to right, top to bottom) is theirs.
+FULL = 0b111111111
+
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,   # Horizontal
+    0b001001001, 0b010010010, 0b100100100,   # Vertical
+    0b100010001, 0b001010100,                # Diagonal
+)
+
+# WINNING[bits] is True when the 9-bit position contains a line: one lookup per check
+WINNING = tuple(any(bits & mask == mask for mask in WIN_MASKS) for bits in range(FULL + 1))
+
+# Cell index of every single-bit value, to walk the set bits of a mask
+CELL_OF_BIT = {1 << i: i for i in range(9)}
+
+
+def is_win(bits):
+    return WINNING[bits]
+
+
+def is_full(own, other):
+    return own | other == FULL
+
+
+def empty_mask(own, other):
+    return ~(own | other) & FULL
+
+
+# `taken` is the union of both players' bits
+def is_legal(taken, cell):
+    return 0 <= cell < 9 and not taken >> cell & 1
+
+
+def cells(mask):
+    found = []
+    while mask:
+        low = mask & -mask
+        found.append(CELL_OF_BIT[low])
+        mask ^= low
+    return found
+
+
+# First empty cell that completes a line for `own`, or None
+def winning_move(own, other):
+    empty = empty_mask(own, other)
+    while empty:
+        low = empty & -empty
+        if WINNING[own | low]:
+            return CELL_OF_BIT[low]
+        empty ^= low
+    return None
+
+
+# ---------------- List Board Adapter ----------------
+# The game screens use a list of 9 strings: '1'-'9' for free cells, else the symbol
+def to_board(own, other, own_symbol, other_symbol):
+    return [own_symbol if own >> i & 1 else other_symbol if other >> i & 1 else str(i + 1)
+            for i in range(9)]
@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+import random
+import time
+
+import numpy as np
+
+
+# One connection playing random legal moves, game after game, until the quota is used
+async def player(host, port, quota, policy, latencies, results, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    await reader.readline()   # greeting
+
+    async def send(line):
+        start = time.perf_counter()
+        writer.write(line.encode("ascii") + b"\n")
+        await writer.drain()
+        reply = (await reader.readline()).decode("utf-8").split()
+        latencies.append(time.perf_counter() - start)
+        return reply
+
+    try:
+        while quota[0] > 0:
+            quota[0] -= 1
+            _, board, state, *_ = await send(f"NEW {rng.choice('XO')} {rng.choice(['first', 'second'])} {policy}")
+            while state == "turn":
+                cell = rng.choice([i for i, c in enumerate(board) if c == "."])
+                reply = await send(f"MOVE {cell + 1}")
+                if reply[0] != "OK":
+                    raise RuntimeError(" ".join(reply))
+                board, state = reply[1], reply[2]
+            results[state] += 1
+        writer.write(b"QUIT\n")
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def run(host, port, games, concurrency, policy, seed):
+    latencies, quota = [], [games]
+    results = {"win": 0, "draw": 0, "loss": 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(player(host, port, quota, policy, latencies, results, seed + i)
+                           for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    played = sum(results.values())
+    print(f"{played} games ({policy} AI), concurrency {concurrency}: "
+          f"{played / elapsed:,.0f} games/s, {len(latencies) / elapsed:,.0f} commands/s")
+    print(f"client results: {results['win']} W / {results['draw']} D / {results['loss']} L")
+    print(f"command latency: p50 {np.percentile(ms, 50):.2f} ms, p99 {np.percentile(ms, 99):.2f} ms, "
+          f"max {ms.max():.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for game_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9009)
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--policy", choices=["solver", "heuristic", "engine"], default="solver")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port, args.games, args.concurrency, args.policy, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import argparse
+import asyncio
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from bitboard import FULL, WINNING, is_legal
+from mnk import Engine, MNKBoard
+from selfplay import heuristic_policy
+from tablebase import analyse, best_move, load_or_build, outcome, position_code
+
+# ---------------- Protocol ----------------
+# One command per line, one reply line per command:
+#   NEW [X|O] [first|second] [solver|heuristic|engine]  -> OK <board> <state> [ai=<cell>]
+#   MOVE <1-9>                                          -> OK <board> <state> [ai=<cell>]
+#   BOARD                                               -> OK <board> <state>
+#   HINT                                                -> HINT <cells> <outcome>
+#   STATS                                               -> STATS key=value ...
+#   QUIT                                                -> BYE
+# <board> is 9 characters (X, O or .), <state> is turn, win, loss or draw
+# (from the client's side), cells are 1-9. Errors reply ERR <message>.
+POLICIES = ("solver", "heuristic", "engine")
+
+table = load_or_build()
+# One generator for every game: a Random per session would be ~2.5 KB each
+rng = random.Random()
+stats = {"connections": 0, "games": 0, "finished": 0, "moves": 0}
+
+
+# ---------------- Session ----------------
+class Session:
+    __slots__ = ("player", "ai", "player_symbol", "ai_symbol", "policy", "state")
+
+    def __init__(self, player_symbol="X", policy="solver"):
+        self.player = 0            # bitboards
+        self.ai = 0
+        self.player_symbol = player_symbol
+        self.ai_symbol = "O" if player_symbol == "X" else "X"
+        self.policy = policy
+        self.state = "turn"
+
+    def board(self):
+        return "".join(self.player_symbol if self.player >> i & 1 else
+                       self.ai_symbol if self.ai >> i & 1 else "." for i in range(9))
+
+    def update_state(self):
+        if WINNING[self.player]:
+            self.state = "win"
+        elif WINNING[self.ai]:
+            self.state = "loss"
+        elif self.player | self.ai == FULL:
+            self.state = "draw"
+        else:
+            self.state = "turn"
+
+
+# ---------------- AI Moves ----------------
+_engine = None
+
+
+# Runs in a worker process: the alpha-beta engine is too slow for the event loop
+def engine_move(own, other):
+    global _engine
+    if _engine is None:
+        _engine = Engine(time_limit=0.5)
+    return _engine.search(MNKBoard.from_bits(own, other))[0]
+
+
+# Table lookups and the heuristic are microseconds and run inline;
+# the engine is sent to the process pool
+async def ai_turn(session, executor):
+    if session.policy == "solver":
+        move = best_move(table, session.ai, session.player, rng)
+    elif session.policy == "heuristic":
+        move = heuristic_policy(session.ai, session.player, rng)
+    else:
+        loop = asyncio.get_running_loop()
+        move = await loop.run_in_executor(executor, engine_move, session.ai, session.player)
+    session.ai |= 1 << move
+    session.update_state()
+    return move
+
+
+def reply(session, ai=None):
+    line = f"OK {session.board()} {session.state}"
+    return line if ai is None else f"{line} ai={ai + 1}"
+
+
+async def command(session, words, executor):
+    verb = words[0].upper() if words else ""
+    if verb == "NEW":
+        args = [w.lower() for w in words[1:]]
+        symbol = "O" if "o" in args else "X"
+        policy = next((a for a in args if a in POLICIES), "solver")
+        session = Session(symbol, policy)
+        stats["games"] += 1
+        ai = await ai_turn(session, executor) if "second" in args else None
+        return session, reply(session, ai)
+    if session is None:
+        return None, "ERR start a game with NEW"
+    if verb == "MOVE":
+        if session.state != "turn":
+            return session, "ERR the game is over; send NEW"
+        try:
+            cell = int(words[1]) - 1
+        except (IndexError, ValueError):
+            return session, "ERR usage: MOVE <1-9>"
+        if not is_legal(session.player | session.ai, cell):
+            return session, "ERR that cell is taken or off the board"
+        session.player |= 1 << cell
+        stats["moves"] += 1
+        session.update_state()
+        ai = await ai_turn(session, executor) if session.state == "turn" else None
+        if session.state != "turn":
+            stats["finished"] += 1
+        return session, reply(session, ai)
+    if verb == "BOARD":
+        return session, reply(session)
+    if verb == "HINT":
+        if session.state != "turn":
+            return session, "ERR the game is over; send NEW"
+        results = analyse(table, session.player, session.ai)
+        best = outcome(table.score[position_code(session.player, session.ai)])
+        picks = ",".join(str(c + 1) for c, r in sorted(results.items()) if r == best)
+        return session, f"HINT {picks} {best}"
+    return session, "ERR unknown command"
+
+
+async def handle_client(reader, writer, executor):
+    stats["connections"] += 1
+    session = None
+    writer.write(b"WELCOME tic-tac-toe: NEW, MOVE, BOARD, HINT, STATS, QUIT\n")
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            words = line.decode("utf-8", "replace").split()
+            verb = words[0].upper() if words else ""
+            if verb == "QUIT":
+                writer.write(b"BYE\n")
+                break
+            if verb == "STATS":
+                text = "STATS " + " ".join(f"{k}={v}" for k, v in stats.items())
+            else:
+                session, text = await command(session, words, executor)
+            writer.write(text.encode("utf-8") + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        stats["connections"] -= 1
+        writer.close()
+
+
+async def serve(host, port, workers):
+    executor = ProcessPoolExecutor(max_workers=workers)
+    server = await asyncio.start_server(
+        lambda r, w: handle_client(r, w, executor), host, port, backlog=4096)
+    print(f"Tic-tac-toe server on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent tic-tac-toe game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9009)
+    parser.add_argument("--workers", type=int, default=2, help="processes for the engine policy")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import time
+from array import array
+
+from mnk import EMPTY, P1, P2, Engine, MNKBoard, display, human_move, random_move
+from colorama import init, Fore
+init(autoreset=True)
+
+# ---------------- Rollout Board ----------------
+# Flat array board for playouts. All buffers are allocated once per search:
+# each playout copies the root position in with slice assignment, and the
+# empty cells live in `empties[:n_empty]` with `slot` giving each cell's
+# index, so taking a random empty cell is an O(1) swap-remove.
+class RolloutBoard:
+    def __init__(self, m, n, k):
+        self.m, self.n, self.k = m, n, k
+        self.size = m * n
+        self.cells = array("b", bytes(self.size))
+        self.empties = array("i", range(self.size))
+        self.slot = array("i", range(self.size))
+        self.n_empty = self.size
+        self.root_cells = array("b", bytes(self.size))
+        self.root_empties = array("i", range(self.size))
+        self.root_slot = array("i", range(self.size))
+        self.root_n_empty = self.size
+
+        # For every cell and direction: the cells ahead and behind, up to k-1 each
+        self.rays = []
+        for r in range(m):
+            for c in range(n):
+                rays = []
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    ahead = tuple((r + dr * i) * n + c + dc * i for i in range(1, k)
+                                  if 0 <= r + dr * i < m and 0 <= c + dc * i < n)
+                    behind = tuple((r - dr * i) * n + c - dc * i for i in range(1, k)
+                                   if 0 <= r - dr * i < m and 0 <= c - dc * i < n)
+                    rays.append((ahead, behind))
+                self.rays.append(tuple(rays))
+        self.neighbors = [
+            tuple(nr * n + nc for nr in range(max(0, r - 1), min(m, r + 2))
+                  for nc in range(max(0, c - 1), min(n, c + 2)) if (nr, nc) != (r, c))
+            for r in range(m) for c in range(n)]
+
+    def set_root(self, cells):
+        self.root_cells[:] = array("b", cells)
+        self.cells[:] = self.root_cells
+        self.n_empty = 0
+        for cell in range(self.size):
+            if cells[cell] == EMPTY:
+                self.empties[self.n_empty] = cell
+                self.slot[cell] = self.n_empty
+                self.n_empty += 1
+        filled = self.n_empty
+        for cell in range(self.size):
+            if cells[cell] != EMPTY:
+                self.empties[filled] = cell
+                self.slot[cell] = filled
+                filled += 1
+        self.root_empties[:] = self.empties
+        self.root_slot[:] = self.slot
+        self.root_n_empty = self.n_empty
+
+    def reset(self):
+        self.cells[:] = self.root_cells
+        self.empties[:] = self.root_empties
+        self.slot[:] = self.root_slot
+        self.n_empty = self.root_n_empty
+
+    # Place a mark; True when it completes k in a row
+    def play(self, cell, player):
+        empties, slot = self.empties, self.slot
+        i, last = slot[cell], empties[self.n_empty - 1]
+        empties[i], slot[last] = last, i
+        empties[self.n_empty - 1], slot[cell] = cell, self.n_empty - 1
+        self.n_empty -= 1
+        cells = self.cells
+        cells[cell] = player
+        for ahead, behind in self.rays[cell]:
+            count = 1
+            for c in ahead:
+                if cells[c] != player:
+                    break
+                count += 1
+            for c in behind:
+                if cells[c] != player:
+                    break
+                count += 1
+            if count >= self.k:
+                return True
+        return False
+
+    # Finish the game with uniformly random moves; returns the winner (EMPTY on a draw)
+    def playout(self, to_move, rng):
+        rand, empties = rng.random, self.empties
+        while self.n_empty:
+            cell = empties[int(rand() * self.n_empty)]
+            if self.play(cell, to_move):
+                return to_move
+            to_move = 3 - to_move
+        return EMPTY
+
+    # Moves worth expanding: empty cells next to a mark (the centre on an empty board)
+    def expansion_moves(self):
+        cells = self.cells
+        if self.n_empty == self.size:
+            return [(self.m // 2) * self.n + self.n // 2]
+        return [c for c in self.empties[:self.n_empty]
+                if any(cells[nb] != EMPTY for nb in self.neighbors[c])]
+
+
+# ---------------- UCT Tree ----------------
+class Node:
+    __slots__ = ("move", "player", "parent", "children", "untried", "visits", "wins", "winner")
+
+    def __init__(self, move, player, parent, untried, winner=None):
+        self.move = move          # the move that led here
+        self.player = player      # who made it
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0           # from `player`'s point of view
+        self.winner = winner      # set when `move` ended the game
+
+    def select(self, c):
+        log_n = math.log(self.visits)
+        return max(self.children, key=lambda ch: ch.wins / ch.visits + c * math.sqrt(log_n / ch.visits))
+
+
+# One tree, `playouts` iterations: select, expand, random playout, backpropagate.
+# Returns root statistics as {move: (visits, wins)} so trees can be merged.
+def search_tree(cells, to_move, m, n, k, playouts, seed, c=1.4):
+    rng = random.Random(seed)
+    board = RolloutBoard(m, n, k)
+    board.set_root(cells)
+    root = Node(None, 3 - to_move, None, board.expansion_moves())
+    rng.shuffle(root.untried)
+
+    for _ in range(playouts):
+        board.reset()
+        node, player = root, to_move
+        # Selection
+        while not node.untried and node.children and node.winner is None:
+            node = node.select(c)
+            board.play(node.move, node.player)
+            player = 3 - node.player
+        # Expansion
+        if node.untried and node.winner is None:
+            move = node.untried.pop()
+            won = board.play(move, player)
+            untried = [] if won else board.expansion_moves()
+            rng.shuffle(untried)
+            child = Node(move, player, node, untried, player if won else (EMPTY if not board.n_empty else None))
+            node.children.append(child)
+            node = child
+            player = 3 - player
+        # Playout
+        winner = node.winner if node.winner is not None else board.playout(player, rng)
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if winner == node.player:
+                node.wins += 1
+            elif winner == EMPTY:
+                node.wins += 0.5
+            node = node.parent
+
+    return {child.move: (child.visits, child.wins) for child in root.children}
+
+
+def _search_worker(args):
+    return search_tree(*args)
+
+
+# ---------------- Root-Parallel Player ----------------
+# Every worker grows its own tree from the same root with a different seed;
+# root visit and win counts are summed and the most visited move is played.
+class MCTSPlayer:
+    def __init__(self, playouts=20000, workers=None, seed=0, c=1.4):
+        self.playouts = playouts
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self.c = c
+        self.calls = 0
+        self.pool = multiprocessing.Pool(self.workers) if self.workers > 1 else None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+
+    def search(self, board):
+        self.calls += 1
+        share = max(1, self.playouts // self.workers)
+        jobs = [(bytes(board.cells), board.to_move, board.m, board.n, board.k, share,
+                 self.seed * 1_000_003 + self.calls * 1009 + w, self.c) for w in range(self.workers)]
+        results = self.pool.map(_search_worker, jobs) if self.pool else [_search_worker(jobs[0])]
+        merged = {}
+        for stats in results:
+            for move, (visits, wins) in stats.items():
+                total = merged.setdefault(move, [0, 0.0])
+                total[0] += visits
+                total[1] += wins
+        move = max(merged, key=lambda mv: merged[mv][0])
+        return move, merged
+
+
+# ---------------- Benchmark ----------------
+# Playouts per second from a mid-game position at each worker count
+def bench_speed(m, n, k, playouts, worker_counts, seed):
+    rng = random.Random(seed)
+    board = MNKBoard(m, n, k)
+    for _ in range(min(6, board.size // 3)):
+        board.play(random_move(board, rng))
+    for workers in worker_counts:
+        player = MCTSPlayer(playouts, workers, seed)
+        player.search(board)   # warm up the pool
+        start = time.perf_counter()
+        player.search(board)
+        elapsed = time.perf_counter() - start
+        player.close()
+        print(f"{workers:>2} worker(s): {playouts / elapsed:>10,.0f} playouts/s")
+
+
+def bench_strength(m, n, k, playouts, workers, games, time_limit, seed):
+    rng = random.Random(seed)
+    player = MCTSPlayer(playouts, workers, seed)
+    engine = Engine(time_limit)
+    opponents = {"random": lambda b: random_move(b, rng), "alpha-beta": lambda b: engine.search(b)[0]}
+    for name, opponent in opponents.items():
+        results = {"win": 0, "draw": 0, "loss": 0}
+        for game in range(games):
+            board = MNKBoard(m, n, k)
+            mcts_side = P1 if game % 2 == 0 else P2
+            engine.tt.clear()
+            while not board.game_over():
+                board.play(player.search(board)[0] if board.to_move == mcts_side else opponent(board))
+            results["draw" if board.winner == EMPTY else "win" if board.winner == mcts_side else "loss"] += 1
+        print(f"vs {name:>10}: {results['win']} W / {results['draw']} D / {results['loss']} L")
+    player.close()
+
+
+def play(m, n, k, playouts, workers):
+    print(f"{m}x{n} board, {k} in a row wins. You are X and move first.")
+    board = MNKBoard(m, n, k)
+    player = MCTSPlayer(playouts, workers)
+    try:
+        while not board.game_over():
+            display(board)
+            if board.to_move == P1:
+                board.play(human_move(board))
+            else:
+                cell, stats = player.search(board)
+                visits, wins = stats[cell]
+                print(Fore.BLUE + f"AI plays {cell // n + 1} {cell % n + 1} "
+                      f"({visits} visits, {wins / visits:.0%} expected)")
+                board.play(cell)
+    finally:
+        player.close()
+    display(board)
+    if board.winner == P1:
+        print(Fore.GREEN + "You won!")
+    elif board.winner == P2:
+        print(Fore.RED + "AI has won the game!")
+    else:
+        print(Fore.YELLOW + "It's a tie!")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo tree search player for m,n,k games")
+    parser.add_argument("command", choices=["play", "bench"])
+    parser.add_argument("--m", type=int, default=9)
+    parser.add_argument("--n", type=int, default=9)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--playouts", type=int, default=20000, help="playouts per move, over all workers")
+    parser.add_argument("--workers", type=int, nargs="+", default=[os.cpu_count() or 1])
+    parser.add_argument("--games", type=int, default=4, help="games per opponent (bench)")
+    parser.add_argument("--time", type=float, default=0.5, help="alpha-beta seconds per move (bench)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "play":
+        play(args.m, args.n, args.k, args.playouts, args.workers[0])
+    else:
+        bench_speed(args.m, args.n, args.k, args.playouts, args.workers, args.seed)
+        bench_strength(args.m, args.n, args.k, args.playouts, args.workers[0], args.games, args.time, args.seed)
+
+
+if __name__ == "__main__":
+    main()
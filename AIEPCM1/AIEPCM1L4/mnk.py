@@ -0,0 +1,415 @@
+import argparse
+import random
+import time
+from colorama import init, Fore, Style
+init(autoreset=True)
+
+# ---------------- m,n,k Board ----------------
+# An m x n board where k in a row wins (3,3,3 is tic-tac-toe, 15,15,5 is
+# gomoku). Cells are numbered row * n + col. Every k-cell line ("window") is
+# precomputed, and each player's marks per window are counted incrementally,
+# so a move updates only the windows through its cell: win detection and the
+# threat evaluation never rescan the board.
+EMPTY, P1, P2 = 0, 1, 2
+WIN_SCORE = 1_000_000
+RADIUS = 2   # candidate moves are empty cells within this distance of a mark
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class Timeout(Exception):
+    pass
+
+
+class MNKBoard:
+    def __init__(self, m=15, n=15, k=5, seed=0):
+        self.m, self.n, self.k = m, n, k
+        self.size = m * n
+        self.cells = [EMPTY] * self.size
+
+        self.windows = []
+        for r in range(m):
+            for c in range(n):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= end_r < m and 0 <= end_c < n:
+                        self.windows.append(tuple((r + dr * i) * n + c + dc * i for i in range(k)))
+        self.windows_of = [[] for _ in range(self.size)]
+        for w, window in enumerate(self.windows):
+            for cell in window:
+                self.windows_of[cell].append(w)
+
+        # Value of an open window holding c marks of one player: grows 8x per mark
+        self.weights = [0] + [8 ** c for c in range(1, k)] + [WIN_SCORE]
+        self.counts = [None, [0] * len(self.windows), [0] * len(self.windows)]
+        self.threat = [0, 0, 0]   # per player: sum of weights of their open windows
+        self.fours = [0, 0, 0]    # per player: open windows one mark short of k
+
+        self.neighbors = [
+            [nr * n + nc
+             for nr in range(max(0, r - RADIUS), min(m, r + RADIUS + 1))
+             for nc in range(max(0, c - RADIUS), min(n, c + RADIUS + 1))
+             if (nr, nc) != (r, c)]
+            for r in range(m) for c in range(n)]
+        self.near = [0] * self.size
+
+        rng = random.Random(seed)
+        self.zobrist = [None] + [[rng.getrandbits(64) for _ in range(self.size)] for _ in range(2)]
+        self.side_key = rng.getrandbits(64)
+        self.hash = 0
+        self.to_move = P1
+        self.winner = EMPTY
+        self.history = []
+
+    # A 3x3 board from tic-tac-toe bitboards (`own` belongs to the side to
+    # move), replaying the marks alternately so the side to move is right
+    @classmethod
+    def from_bits(cls, own, other):
+        board = cls(3, 3, 3)
+        mine = [i for i in range(9) if own >> i & 1]
+        theirs = [i for i in range(9) if other >> i & 1]
+        first, second = (theirs, mine) if len(theirs) > len(mine) else (mine, theirs)
+        for i in range(len(first) + len(second)):
+            board.play((first if i % 2 == 0 else second)[i // 2])
+        return board
+
+    def play(self, cell):
+        p = self.to_move
+        o = 3 - p
+        own, other, weights = self.counts[p], self.counts[o], self.weights
+        for w in self.windows_of[cell]:
+            cp, co = own[w], other[w]
+            if co == 0:
+                self.threat[p] += weights[cp + 1] - weights[cp]
+                if cp + 1 == self.k - 1:
+                    self.fours[p] += 1
+                elif cp + 1 == self.k:
+                    self.fours[p] -= 1
+                    self.winner = p
+            elif cp == 0:
+                self.threat[o] -= weights[co]   # this mark closes their window
+                if co == self.k - 1:
+                    self.fours[o] -= 1
+            own[w] = cp + 1
+        for nb in self.neighbors[cell]:
+            self.near[nb] += 1
+        self.cells[cell] = p
+        self.hash ^= self.zobrist[p][cell] ^ self.side_key
+        self.history.append(cell)
+        self.to_move = o
+
+    def undo(self):
+        cell = self.history.pop()
+        o = self.to_move
+        p = 3 - o
+        own, other, weights = self.counts[p], self.counts[o], self.weights
+        for w in self.windows_of[cell]:
+            cp = own[w] = own[w] - 1
+            co = other[w]
+            if co == 0:
+                self.threat[p] -= weights[cp + 1] - weights[cp]
+                if cp + 1 == self.k - 1:
+                    self.fours[p] -= 1
+                elif cp + 1 == self.k:
+                    self.fours[p] += 1
+            elif cp == 0:
+                self.threat[o] += weights[co]
+                if co == self.k - 1:
+                    self.fours[o] += 1
+        for nb in self.neighbors[cell]:
+            self.near[nb] -= 1
+        self.cells[cell] = EMPTY
+        self.hash ^= self.zobrist[p][cell] ^ self.side_key
+        self.winner = EMPTY   # play stops at the first win, so undoing any move clears it
+        self.to_move = p
+
+    def is_full(self):
+        return len(self.history) == self.size
+
+    def game_over(self):
+        return self.winner != EMPTY or self.is_full()
+
+    # Static evaluation from the side to move
+    def evaluate(self):
+        return self.threat[self.to_move] - self.threat[3 - self.to_move]
+
+    def candidates(self):
+        if not self.history:
+            return [(self.m // 2) * self.n + self.n // 2]
+        cells, near = self.cells, self.near
+        return [c for c in range(self.size) if near[c] and cells[c] == EMPTY]
+
+    # How much a move raises the mover's windows plus how much it blocks the opponent's
+    def move_value(self, cell):
+        p = self.to_move
+        own, other, weights = self.counts[p], self.counts[3 - p], self.weights
+        value = 0
+        for w in self.windows_of[cell]:
+            cp, co = own[w], other[w]
+            if co == 0:
+                value += weights[cp + 1]
+            elif cp == 0:
+                value += weights[co + 1]
+        return value
+
+    def ordered_moves(self, first=None):
+        moves = sorted(self.candidates(), key=self.move_value, reverse=True)
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+
+# ---------------- Search ----------------
+# Negamax alpha-beta with a Zobrist-keyed transposition table, iterative
+# deepening and a wall-clock budget per move. Below the root only the
+# max_branch best-ordered moves are searched (None searches all), which is
+# what lets big boards reach useful depths; wins and forced blocks always
+# order first, so they are never cut.
+class Engine:
+    def __init__(self, time_limit=1.0, max_depth=None, max_branch=12, tt_size=1_000_000):
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.max_branch = max_branch
+        self.tt_size = tt_size
+        self.tt = {}
+        self.nodes = 0
+        self.deadline = None
+
+    def negamax(self, board, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise Timeout
+        if board.winner:
+            return -(WIN_SCORE - ply)   # the previous move won
+        if board.is_full():
+            return 0
+        if board.fours[board.to_move]:
+            return WIN_SCORE - ply - 1   # the mover completes a line next move
+        if depth == 0:
+            return board.evaluate()
+
+        entry = self.tt.get(board.hash)
+        tt_move = None
+        if entry is not None:
+            entry_depth, value, flag, tt_move = entry
+            if entry_depth >= depth:
+                value = _from_tt(value, ply)
+                if flag == EXACT:
+                    return value
+                if flag == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        alpha0 = alpha
+        best, best_move = -WIN_SCORE - 1, None
+        moves = board.ordered_moves(tt_move)
+        if ply and self.max_branch:
+            moves = moves[:self.max_branch]
+        for cell in moves:
+            board.play(cell)
+            value = -self.negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.undo()
+            if value > best:
+                best, best_move = value, cell
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        flag = UPPER if best <= alpha0 else LOWER if best >= beta else EXACT
+        if len(self.tt) >= self.tt_size:
+            self.tt.clear()
+        self.tt[board.hash] = (depth, _to_tt(best, ply), flag, best_move)
+        return best
+
+    # Best move for the side to move: (cell, score, depth completed). The root
+    # is searched here so the best move of the last completed depth is kept
+    # and tried first at the next depth.
+    def search(self, board):
+        self.nodes = 0
+        self.deadline = time.perf_counter() + self.time_limit
+        start_len = len(board.history)
+        moves = board.ordered_moves()
+        best_move, best_value, completed = moves[0], 0, 0
+        max_depth = min(self.max_depth or board.size, board.size - len(board.history))
+        for depth in range(1, max_depth + 1):
+            alpha, best = -WIN_SCORE - 1, moves[0]
+            try:
+                for cell in moves:
+                    board.play(cell)
+                    value = -self.negamax(board, depth - 1, -WIN_SCORE - 1, -alpha, 1)
+                    board.undo()
+                    if value > alpha:
+                        alpha, best = value, cell
+            except Timeout:
+                while len(board.history) > start_len:
+                    board.undo()
+                break
+            best_move, best_value, completed = best, alpha, depth
+            moves.remove(best)
+            moves.insert(0, best)
+            if abs(alpha) >= WIN_SCORE - board.size:
+                break   # forced win or loss found: deeper search cannot change it
+        return best_move, best_value, completed
+
+
+# Mate scores are stored relative to the node, so they stay valid at any ply
+def _to_tt(value, ply):
+    if value >= WIN_SCORE - 10_000:
+        return value + ply
+    if value <= -WIN_SCORE + 10_000:
+        return value - ply
+    return value
+
+
+def _from_tt(value, ply):
+    if value >= WIN_SCORE - 10_000:
+        return value - ply
+    if value <= -WIN_SCORE + 10_000:
+        return value + ply
+    return value
+
+
+# ---------------- Opponents ----------------
+def random_move(board, rng):
+    return rng.choice([c for c in range(board.size) if board.cells[c] == EMPTY])
+
+
+def greedy_move(board):
+    return board.ordered_moves()[0]
+
+
+# ---------------- Benchmark ----------------
+def bench_speed(m, n, k, time_limit, positions, seed):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(positions):
+        board = MNKBoard(m, n, k)
+        for _ in range(min(6, board.size // 2)):   # a short random opening
+            board.play(random_move(board, rng))
+            if board.game_over():
+                break
+        if board.game_over():
+            continue
+        engine = Engine(time_limit)
+        start = time.perf_counter()
+        _, _, depth = engine.search(board)
+        elapsed = time.perf_counter() - start
+        rows.append((engine.nodes, elapsed, depth))
+    nodes = sum(r[0] for r in rows)
+    elapsed = sum(r[1] for r in rows)
+    print(f"{m}x{n}, k={k}: {len(rows)} positions, {nodes / elapsed:,.0f} nodes/s, "
+          f"depth {min(r[2] for r in rows)}-{max(r[2] for r in rows)} in {time_limit}s per move")
+
+
+def play_game(m, n, k, first, second):
+    board = MNKBoard(m, n, k)
+    players = {P1: first, P2: second}
+    while not board.game_over():
+        board.play(players[board.to_move](board))
+    return board.winner
+
+
+def bench_strength(m, n, k, time_limit, games, seed):
+    rng = random.Random(seed)
+    engine = Engine(time_limit)
+
+    def engine_move(board):
+        return engine.search(board)[0]
+
+    opponents = {"random": lambda b: random_move(b, rng), "greedy": greedy_move}
+    if (m, n, k) == (3, 3, 3):
+        from tablebase import best_move, load_or_build
+        table = load_or_build()
+
+        def perfect(board):
+            own = sum(1 << c for c in range(9) if board.cells[c] == board.to_move)
+            other = sum(1 << c for c in range(9) if board.cells[c] == 3 - board.to_move)
+            return best_move(table, own, other, rng)
+        opponents["perfect"] = perfect
+
+    for name, opponent in opponents.items():
+        results = {"win": 0, "draw": 0, "loss": 0}
+        start = time.perf_counter()
+        for game in range(games):
+            engine.tt.clear()
+            engine_first = game % 2 == 0
+            winner = play_game(m, n, k, *((engine_move, opponent) if engine_first else (opponent, engine_move)))
+            engine_side = P1 if engine_first else P2
+            results["draw" if winner == EMPTY else "win" if winner == engine_side else "loss"] += 1
+        print(f"vs {name:>7}: {results['win']} W / {results['draw']} D / {results['loss']} L "
+              f"({time.perf_counter() - start:.1f}s)")
+
+
+# ---------------- Play ----------------
+def display(board):
+    width = len(str(board.n))
+    print("\n" + " " * (width + 1) + " ".join(f"{c + 1:>{width}}" for c in range(board.n)))
+    for r in range(board.m):
+        row = []
+        for c in range(board.n):
+            cell = board.cells[r * board.n + c]
+            mark = (Fore.RED + "X" if cell == P1 else Fore.BLUE + "O" if cell == P2 else Fore.YELLOW + ".")
+            row.append(" " * (width - 1) + mark + Style.RESET_ALL)
+        print(f"{r + 1:>{width}} " + " ".join(row))
+    print()
+
+
+def human_move(board):
+    while True:
+        try:
+            r, c = (int(x) for x in input(f"Your move (row col, 1-{board.m} 1-{board.n}): ").split())
+            cell = (r - 1) * board.n + (c - 1)
+            if 0 < r <= board.m and 0 < c <= board.n and board.cells[cell] == EMPTY:
+                return cell
+            print(Fore.RED + "That cell is taken or off the board.")
+        except ValueError:
+            print(Fore.RED + "Enter a row and a column, e.g. 8 8")
+
+
+def play(m, n, k, time_limit):
+    print(Fore.CYAN + f"{m}x{n} board, {k} in a row wins. You are X and move first.")
+    board = MNKBoard(m, n, k)
+    engine = Engine(time_limit)
+    while not board.game_over():
+        display(board)
+        if board.to_move == P1:
+            board.play(human_move(board))
+        else:
+            cell, value, depth = engine.search(board)
+            print(Fore.BLUE + f"AI plays {cell // n + 1} {cell % n + 1} "
+                  f"(depth {depth}, {engine.nodes:,} nodes)")
+            board.play(cell)
+    display(board)
+    if board.winner == P1:
+        print(Fore.GREEN + "You won!")
+    elif board.winner == P2:
+        print(Fore.RED + "AI has won the game!")
+    else:
+        print(Fore.YELLOW + "It's a tie!")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="m,n,k-game engine (tic-tac-toe, gomoku, ...)")
+    parser.add_argument("command", choices=["play", "bench"])
+    parser.add_argument("--m", type=int, default=15, help="rows")
+    parser.add_argument("--n", type=int, default=15, help="columns")
+    parser.add_argument("--k", type=int, default=5, help="marks in a row to win")
+    parser.add_argument("--time", type=float, default=1.0, help="seconds per engine move")
+    parser.add_argument("--games", type=int, default=10, help="games per opponent (bench)")
+    parser.add_argument("--positions", type=int, default=5, help="positions to time (bench)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "play":
+        play(args.m, args.n, args.k, args.time)
+    else:
+        bench_speed(args.m, args.n, args.k, args.time, args.positions, args.seed)
+        bench_strength(args.m, args.n, args.k, args.time, args.games, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+
+from bitboard import FULL, WINNING, cells, empty_mask, winning_move
+from mcts import search_tree
+from mnk import Engine, MNKBoard
+from tablebase import best_move, load_or_build
+
+# ---------------- Move Policies ----------------
+# A policy maps (own bits, other bits, rng) to a cell, seen from the side to move
+def random_policy(own, other, rng):
+    return rng.choice(cells(empty_mask(own, other)))
+
+
+# The game's original AI: win if possible, else block, else a random cell
+def heuristic_policy(own, other, rng):
+    move = winning_move(own, other)
+    if move is None:
+        move = winning_move(other, own)
+    if move is None:
+        move = random_policy(own, other, rng)
+    return move
+
+
+table = None
+
+
+def solver_policy(own, other, rng):
+    return best_move(table, own, other, rng)
+
+
+engine = None
+
+
+# The m,n,k search engine on a 3x3 board (only 9 empty cells, so it is exact)
+def mnk_policy(own, other, rng):
+    return engine.search(MNKBoard.from_bits(own, other))[0]
+
+
+# Single-tree UCT with a small budget, seeded from the game's rng
+def mcts_policy(own, other, rng):
+    board = MNKBoard.from_bits(own, other)
+    stats = search_tree(bytes(board.cells), board.to_move, 3, 3, 3, 1000, rng.getrandbits(32))
+    return max(stats, key=lambda move: stats[move][0])
+
+
+POLICIES = {
+    "random": random_policy,
+    "heuristic": heuristic_policy,
+    "solver": solver_policy,
+    "mnk": mnk_policy,
+    "mcts": mcts_policy,
+}
+
+
+def _init_worker(names):
+    global table, engine
+    if "solver" in names:
+        table = load_or_build()
+    if "mnk" in names:
+        engine = Engine(time_limit=1.0, max_depth=9)
+
+
+# ---------------- Latency Histogram ----------------
+# Per-move latency in power-of-two nanosecond buckets: cheap to record and
+# mergeable across processes
+BUCKETS = 40
+
+
+def new_stats():
+    return {"games": 0, "a_wins": 0, "draws": 0, "b_wins": 0, "a_first_wins": 0, "b_first_wins": 0,
+            "moves": [0, 0], "latency_ns": [0, 0], "histogram": [[0] * BUCKETS, [0] * BUCKETS]}
+
+
+def merge(total, part):
+    for key in ("games", "a_wins", "draws", "b_wins", "a_first_wins", "b_first_wins"):
+        total[key] += part[key]
+    for side in (0, 1):
+        total["moves"][side] += part["moves"][side]
+        total["latency_ns"][side] += part["latency_ns"][side]
+        total["histogram"][side] = [a + b for a, b in zip(total["histogram"][side], part["histogram"][side])]
+
+
+def percentile_ns(histogram, q):
+    total = sum(histogram)
+    seen = 0
+    for bucket, count in enumerate(histogram):
+        seen += count
+        if total and seen >= q * total:
+            return 2 ** bucket   # upper bound of the bucket
+    return None
+
+
+# ---------------- Self-Play ----------------
+# Play `games` games between policies a and b, alternating who moves first.
+# Every chunk has its own seed, so a run is reproducible for any worker count.
+def play_chunk(args):
+    name_a, name_b, games, seed = args
+    policies = (POLICIES[name_a], POLICIES[name_b])
+    rng = random.Random(seed)
+    stats = new_stats()
+    histograms, moves, latency = stats["histogram"], stats["moves"], stats["latency_ns"]
+    clock = time.perf_counter_ns
+
+    for game in range(games):
+        side = game % 2          # 0: a moves first
+        first = side
+        own, other = 0, 0
+        result = None
+        while True:
+            start = clock()
+            cell = policies[side](own, other, rng)
+            elapsed = clock() - start
+            moves[side] += 1
+            latency[side] += elapsed
+            histograms[side][min(elapsed.bit_length(), BUCKETS - 1)] += 1
+
+            own |= 1 << cell
+            if WINNING[own]:
+                result = side
+                break
+            if own | other == FULL:
+                break
+            own, other, side = other, own, 1 - side
+
+        stats["games"] += 1
+        if result is None:
+            stats["draws"] += 1
+        elif result == 0:
+            stats["a_wins"] += 1
+            stats["a_first_wins"] += first == 0
+        else:
+            stats["b_wins"] += 1
+            stats["b_first_wins"] += first == 1
+    return stats
+
+
+def run(name_a, name_b, games, workers=None, seed=0, chunk_size=10_000):
+    workers = workers or os.cpu_count() or 1
+    jobs = [(name_a, name_b, min(chunk_size, games - start), seed * 1_000_003 + i)
+            for i, start in enumerate(range(0, games, chunk_size))]
+    total = new_stats()
+    start = time.perf_counter()
+    if workers == 1:
+        _init_worker({name_a, name_b})
+        for job in jobs:
+            merge(total, play_chunk(job))
+    else:
+        with multiprocessing.Pool(workers, _init_worker, ({name_a, name_b},)) as pool:
+            for part in pool.imap_unordered(play_chunk, jobs):
+                merge(total, part)
+    total["elapsed_s"] = time.perf_counter() - start
+    total["workers"] = workers
+    return total
+
+
+def report(name_a, name_b, stats):
+    games = stats["games"]
+    print(f"{name_a} vs {name_b}: {games:,} games in {stats['elapsed_s']:.2f}s "
+          f"({games / stats['elapsed_s']:,.0f} games/s on {stats['workers']} worker(s))")
+    print(f"  {name_a} wins {100 * stats['a_wins'] / games:.2f}% "
+          f"({stats['a_first_wins']:,} moving first) | draws {100 * stats['draws'] / games:.2f}% | "
+          f"{name_b} wins {100 * stats['b_wins'] / games:.2f}% ({stats['b_first_wins']:,} moving first)")
+    for side, name in enumerate((name_a, name_b)):
+        moves = stats["moves"][side]
+        mean = stats["latency_ns"][side] / moves / 1000 if moves else 0
+        print(f"  {name:>9} move latency: mean {mean:.2f} us, "
+              f"p50 <= {percentile_ns(stats['histogram'][side], 0.5) / 1000:.2f} us, "
+              f"p99 <= {percentile_ns(stats['histogram'][side], 0.99) / 1000:.2f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless tic-tac-toe self-play")
+    parser.add_argument("a", choices=POLICIES)
+    parser.add_argument("b", choices=POLICIES)
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--json", help="also write the raw counts here")
+    args = parser.parse_args()
+
+    stats = run(args.a, args.b, args.games, args.workers, args.seed, args.chunk_size)
+    report(args.a, args.b, stats)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"a": args.a, "b": args.b, "seed": args.seed, **stats}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
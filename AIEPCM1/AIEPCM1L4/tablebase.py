@@ -0,0 +1,123 @@
+import os
+import random
+from array import array
+from collections import namedtuple
+
+from bitboard import FULL, WINNING, cells, empty_mask
+
+# ---------------- Perfect-Play Tablebase ----------------
+# Every reachable position is solved once and stored in two arrays indexed by
+# a base-3 code of the board seen from the side to move: digit i is 0 for an
+# empty cell, 1 for the mover's mark and 2 for the opponent's. Because the
+# code is relative to the mover, one table serves X and O, whoever starts.
+#   best[code]   9-bit mask of every optimal move (0 once the game is over)
+#   score[code]  +n: the mover wins, -n: the mover loses, 0: draw, where a
+#                larger n means the game ends sooner (n = 10 - cells filled)
+Tablebase = namedtuple("Tablebase", ["best", "score", "positions"])
+
+SIZE = 3 ** 9
+MAGIC = b"TTT1"
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebase.bin")
+
+# Base-3 weight of every set of cells, so a code is two lookups and an add
+CODE_OF_BITS = tuple(sum(3 ** i for i in range(9) if bits >> i & 1) for bits in range(FULL + 1))
+
+
+def position_code(own, other):
+    return CODE_OF_BITS[own] + 2 * CODE_OF_BITS[other]
+
+
+# Negamax over every position reachable from the empty board
+def build():
+    best = array("H", [0]) * SIZE
+    score = array("b", [0]) * SIZE
+    seen = bytearray(SIZE)
+
+    def solve(own, other):
+        code = position_code(own, other)
+        if seen[code]:
+            return score[code]
+        seen[code] = 1
+        filled = bin(own | other).count("1")
+        if WINNING[other]:              # the opponent just completed a line
+            score[code] = -(10 - filled)
+            return score[code]
+        if own | other == FULL:
+            return 0
+
+        top, moves = None, 0
+        empty = empty_mask(own, other)
+        while empty:
+            low = empty & -empty
+            value = -solve(other, own | low)
+            if top is None or value > top:
+                top, moves = value, low
+            elif value == top:
+                moves |= low
+            empty ^= low
+        best[code], score[code] = moves, top
+        return top
+
+    solve(0, 0)
+    return Tablebase(best, score, sum(seen))
+
+
+def save(table, path=DEFAULT_PATH):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(table.positions.to_bytes(4, "little"))
+        table.best.tofile(f)
+        table.score.tofile(f)
+    os.replace(tmp, path)
+
+
+def load(path=DEFAULT_PATH):
+    with open(path, "rb") as f:
+        if f.read(4) != MAGIC:
+            raise ValueError(f"{path} is not a tic-tac-toe tablebase")
+        positions = int.from_bytes(f.read(4), "little")
+        best, score = array("H"), array("b")
+        best.fromfile(f, SIZE)
+        score.fromfile(f, SIZE)
+    return Tablebase(best, score, positions)
+
+
+# Load the persisted table, solving and saving it on first use
+def load_or_build(path=DEFAULT_PATH):
+    try:
+        return load(path)
+    except (OSError, EOFError, ValueError):
+        table = build()
+        try:
+            save(table, path)
+        except OSError:
+            pass  # read-only install: keep the in-memory table
+        return table
+
+
+# ---------------- Lookups ----------------
+def best_move(table, own, other, rng=random):
+    moves = table.best[position_code(own, other)]
+    return rng.choice(cells(moves)) if moves else None
+
+
+def outcome(score):
+    return "win" if score > 0 else "loss" if score < 0 else "draw"
+
+
+# Outcome for the mover of every legal move, e.g. {4: 'draw', 0: 'loss', ...}
+def analyse(table, own, other):
+    result = {}
+    for cell in cells(empty_mask(own, other)):
+        after = own | 1 << cell
+        score = 10 - bin(after | other).count("1") if WINNING[after] else -table.score[position_code(other, after)]
+        result[cell] = outcome(score)
+    return result
+
+
+if __name__ == "__main__":
+    table = build()
+    save(table)
+    print(f"Solved {table.positions} positions; empty board is a {outcome(table.score[0])} "
+          f"(best first moves: {[c + 1 for c in cells(table.best[0])]})")
@@ -1,60 +1,341 @@
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
 from textblob import TextBlob
 from colorama import init, Fore
+import os
 import time
 import sys
 
+from ann import ann_search, build_ivf_index, embed, rerank_exact
+from artifacts import load_or_build
+from cache import ResultCache
+from catalog import convert_rows
+from fields import DEFAULT_FIELD_WEIGHTS, extend_field_blocks, field_scores
+from genre_index import (add_to_genre_index, build_genre_index, lookup, normalize_genre, query_genre,
+                         remove_from_genre_index)
+from incremental import build_analyzer, transform_frozen
+from neighbors import neighbors_of, patch_neighbor_index
+from profiles import ProfileStore, score_users
+from ranking import DEFAULT_WEIGHTS, SIGNAL_COLUMNS, build_signals, extend_signals, rank
+from sentiment import mood_match, score_texts
+from title_index import (add_to_title_index, build_title_index, exact_match, remove_from_title_index,
+                         suggest)
+
 # Initialize colorama
 init(autoreset=True)
 
-# Load and preprocess the dataset
+# Load the dataset artifacts (TF-IDF space, top-k neighbor index, columns).
+# They are memory-mapped from disk and only rebuilt when the CSV content changes.
 def load_data(file_path='imdb_top_1000.csv'):
     try:
-        df = pd.read_csv(file_path)
-        df['combined_features'] = df['Genre'].fillna('') + ' ' + df['Overview'].fillna('')
-        return df
+        return load_or_build(file_path)
     except FileNotFoundError:
         print(Fore.RED + f"Error: The file '{file_path}' was not found.")
         sys.exit()
 
-movies_df = load_data()
+# MOVIE_CATALOG points the recommender (and the server/benchmarks) at another CSV
+catalog = load_data(os.environ.get('MOVIE_CATALOG', 'imdb_top_1000.csv'))
+catalog_version = catalog['version']
+movies_df = pd.DataFrame(catalog['columns'])
+tfidf_matrix = catalog['tfidf_matrix']
+neighbor_index = catalog['neighbor_index']
+field_blocks = catalog['fields']
+
+# Column arrays, plus exact and typo-tolerant title lookup for "more like this" queries
+titles = catalog['columns']['Series_Title']
+genres = np.asarray(catalog['columns']['Genre'], dtype=object)
+ratings = catalog['columns']['IMDB_Rating']
+# Overview sentiment, scored once when the artifacts were built
+polarity = catalog['columns']['Polarity']
+title_index = build_title_index(titles)
+
+# Genre -> row ids sorted by rating, parsed once instead of a regex scan per query
+genre_index = build_genre_index(genres, ratings)
+
+# Normalized rating / votes / Metascore / gross / recency signals for rank_movies()
+signals = build_signals(catalog['columns'])
+ranking_weights = dict(DEFAULT_WEIGHTS)
+
+# Returning users' taste profiles (TF-IDF sums of the titles they liked)
+profiles_path = os.environ.get('MOVIE_PROFILES', 'profiles.npz')
+# (rebuilt from the liked titles when the store was saved against another catalog)
+profiles = (ProfileStore.load(profiles_path, catalog_version, lambda title: exact_match(title_index, title),
+                              tfidf_matrix)
+            if os.path.exists(profiles_path) else ProfileStore())
+
+# Optional approximate mode for very large catalogs (see enable_ann)
+ann_index = None
+ann_nprobe = 8
+ann_shortlist = 500
+
+# Switch similar_to() to approximate search over dense SVD embeddings.
+# Raising nprobe scans more inverted lists: better recall, higher latency.
+# The best `shortlist` candidates are re-ranked by exact TF-IDF cosine.
+def enable_ann(dim=128, n_lists=None, nprobe=8, shortlist=500):
+    global ann_index, ann_nprobe, ann_shortlist
+    ann_index = build_ivf_index(embed(tfidf_matrix, dim), n_lists)
+    ann_nprobe = nprobe
+    ann_shortlist = shortlist
+
+# Incremental catalog updates. New titles are vectorized in the frozen TF-IDF
+# vocabulary (unseen terms are only counted in oov_doc_freq until the next full
+# rebuild), and only the neighbor rows they affect are patched. Removed titles
+# are tombstoned in `active` so row ids stay stable. Updates live in memory;
+# the CSV and its artifacts remain the source of truth on restart.
+active = np.ones(len(titles), dtype=bool)
+oov_doc_freq = Counter()
+term_ids = None
+analyzer = None
+catalog_updates = 0
+
+def add_movies(rows):
+    global movies_df, tfidf_matrix, neighbor_index, titles, genres, ratings, polarity
+    global field_blocks, genre_index, title_index, signals, active, term_ids, analyzer, catalog_version, catalog_updates
+    new = pd.DataFrame(rows)
+    if new.empty:
+        return np.empty(0, dtype=np.int32)
+    if term_ids is None:
+        term_ids = {term: col for col, term in enumerate(catalog['vocabulary'])}
+        analyzer = build_analyzer()
+
+    text = new['Genre'].fillna('') + ' ' + new['Overview'].fillna('')
+    vectors = transform_frozen(text, term_ids, catalog['idf'], analyzer, oov_doc_freq)
+    new_ids = np.arange(len(titles), len(titles) + len(new), dtype=np.int32)
+
+    titles = np.concatenate([titles, new['Series_Title'].to_numpy(dtype=str)])
+    genres = np.concatenate([genres, new['Genre'].fillna('').to_numpy(dtype=str)])
+    ratings = np.concatenate([ratings, new['IMDB_Rating'].to_numpy(dtype=ratings.dtype)])
+    polarity = np.concatenate([polarity, score_texts(new['Overview'].fillna(''))[0]])
+    active = np.concatenate([active, np.ones(len(new), dtype=bool)])
+    movies_df = pd.concat([movies_df, pd.DataFrame({
+        'Series_Title': titles[new_ids], 'Genre': genres[new_ids], 'IMDB_Rating': ratings[new_ids],
+    }, index=new_ids)])
+    title_index = add_to_title_index(title_index, new_ids, titles[new_ids])
+
+    tfidf_matrix = sparse.vstack([tfidf_matrix, vectors], format='csr')
+    neighbor_index = patch_neighbor_index(neighbor_index, tfidf_matrix, new_ids, k=catalog['meta']['k'])
+    field_blocks = extend_field_blocks(field_blocks, new)
+    genre_index = add_to_genre_index(genre_index, new_ids, genres[new_ids], ratings)
+    signals = extend_signals(signals, convert_rows(new)[SIGNAL_COLUMNS])
+
+    catalog_updates += 1
+    catalog_version = f"{catalog['version']}+{catalog_updates}"
+    return new_ids
+
+def remove_movies(ids):
+    global genre_index, catalog_version, catalog_updates
+    ids = np.asarray([i for i in ids if active[i]], dtype=np.int32)
+    if len(ids) == 0:
+        return
+    active[ids] = False
+    remove_from_title_index(title_index, ids, titles[ids])
+    genre_index = remove_from_genre_index(genre_index, ids, genres[ids])
+
+    catalog_updates += 1
+    catalog_version = f"{catalog['version']}+{catalog_updates}"
+
+# Row of an exact (case and punctuation insensitive) title match, or None
+def find_title(title):
+    row = exact_match(title_index, title)
+    return row if row is not None and active[row] else None
+
+# Closest catalog titles to what the user typed, for "Did you mean ...?"
+def suggest_titles(title, top_n=5):
+    return list(titles[suggest(title_index, title, top_n, active)])
+
+def _unknown_title(title):
+    close = suggest_titles(title, 3)
+    hint = f" Did you mean: {', '.join(close)}?" if close else ""
+    return f"No movie titled '{title}' found in the catalog.{hint}"
+
+# Remember that a user liked a title; their "for you" list updates immediately
+def record_like(user, title):
+    row = find_title(title)
+    if row is None:
+        return False
+    profiles.record_like(user, row, tfidf_matrix)
+    return True
+
+def save_profiles():
+    profiles.save(profiles_path, catalog_version, titles)
+
+# Personal picks for a returning user, closest to their liked titles first
+def for_you(user, top_n=5):
+    if user not in profiles:
+        return f"No liked movies recorded for '{user}' yet."
+    _, ids, scores = next(score_users(profiles, [user], tfidf_matrix, top_n, active=active))
+    if len(ids) == 0:
+        return f"No new picks for '{user}' yet."
+    return pd.DataFrame({
+        'Series_Title': titles[ids],
+        'Genre': genres[ids],
+        'IMDB_Rating': ratings[ids],
+        'Score': scores,
+    }, index=ids)
+
+# TextBlob analysis is memoized and shared by every session: moods repeat a lot
+@lru_cache(maxsize=4096)
+def mood_polarity(mood):
+    return TextBlob(mood).sentiment.polarity
 
-# Vectorize combined features and compute cosine similarity
-tfidf = TfidfVectorizer(stop_words='english')
-tfidf_matrix = tfidf.fit_transform(movies_df['combined_features'])
-cosine_sim = cosine_similarity(tfidf_matrix, tfidf_matrix)
+# Sentiment ordering using mood polarity: positive -> best rated first,
+# negative -> lowest rated first, neutral -> catalog order
+def mood_order(polarity):
+    return 1 if polarity > 0 else -1 if polarity < 0 else 0
 
-# Function to recommend movies based on similarity, mood, and rating
+# Repeated recommend_movies() queries are answered from here; entries are
+# keyed by the catalog version, so any catalog change empties the cache
+result_cache = ResultCache(maxsize=4096)
+
+# Function to recommend movies based on genre, mood, and rating
 def recommend_movies(genre=None, mood=None, rating=None, top_n=5):
-    if genre:
-        genre_movies = movies_df[movies_df['Genre'].str.contains(genre, case=False, na=False)]
-    else:
-        genre_movies = movies_df
+    order = mood_order(mood_polarity(mood)) if mood else 0
+    key = (normalize_genre(genre), order, float(rating) if rating else None, top_n)
+    ids = result_cache.get(key, catalog_version)
+    if ids is None:
+        ids = query_genre(genre_index, genre, rating, order, top_n)
+        result_cache.put(key, ids, catalog_version)
+    if len(ids) == 0:
+        return f"No movies found for genre '{genre}' with that rating range."
+
+    return movies_df.iloc[ids][['Series_Title', 'Genre', 'IMDB_Rating']]
+
+# Change the default ranking weights; takes effect on the next rank_movies() call
+def set_ranking_weights(**weights):
+    _check_weights(weights)
+    ranking_weights.update(weights)
 
-    if rating:
-        genre_movies = genre_movies[genre_movies['IMDB_Rating'] >= rating]
+def _check_weights(weights):
+    unknown = set(weights) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unknown ranking weights: {', '.join(sorted(unknown))}")
 
-    if genre_movies.empty:
+# Rank movies by a weighted mix of rating, votes, Metascore, gross and recency,
+# plus TF-IDF similarity to seed_title when one is given and closeness of each
+# overview's tone to the mood when one is given. `weights` overrides the
+# defaults for this call only.
+def rank_movies(genre=None, rating=None, seed_title=None, weights=None, top_n=5, mood=None):
+    _check_weights(weights or {})
+    candidates = query_genre(genre_index, genre, rating, -1, len(active))
+    if len(candidates) == 0:
         return f"No movies found for genre '{genre}' with that rating range."
 
-    # Sentiment filtering using mood polarity
-    if mood:
-        polarity = TextBlob(mood).sentiment.polarity
-        if polarity > 0:
-            genre_movies = genre_movies.sort_values(by='IMDB_Rating', ascending=False)
-        elif polarity < 0:
-            genre_movies = genre_movies.sort_values(by='IMDB_Rating', ascending=True)
+    similarity = None
+    if seed_title:
+        row = find_title(seed_title)
+        if row is None:
+            return _unknown_title(seed_title)
+        candidates = candidates[candidates != row]
+        similarity = (tfidf_matrix @ tfidf_matrix[row].T).toarray().ravel()[candidates]
+
+    match = mood_match(mood_polarity(mood), polarity[candidates]) if mood else None
+    ids, scores = rank(signals, {**ranking_weights, **(weights or {})}, candidates, similarity, top_n, match)
+    if len(ids) == 0:
+        return f"No movies found for genre '{genre}' with that rating range."
+    return pd.DataFrame({
+        'Series_Title': titles[ids],
+        'Genre': genres[ids],
+        'IMDB_Rating': ratings[ids],
+        'Score': scores,
+    }, index=ids)
+
+# Recommend movies similar to a seed title, ranked by cosine similarity.
+# Only the seed's precomputed neighbor row (or, in ANN mode, the same number of
+# approximate neighbors) is scanned, never the whole catalog, so at most the
+# index's k neighbors can be returned. Passing field_weights (e.g.
+# {'genre': 2, 'director': 1}) scores the whole catalog from the per-field
+# blocks instead, with each field weighted as asked.
+def similar_to(title, genre=None, min_rating=None, top_n=5, field_weights=None):
+    row = find_title(title)
+    if row is None:
+        return _unknown_title(title)
+    if field_weights:
+        return _similar_by_fields(title, row, genre, min_rating, top_n, field_weights)
+
+    # Titles added after enable_ann() are served from the patched exact index
+    if ann_index is not None and row < len(ann_index.embeddings):
+        k = catalog['meta']['k']
+        ids, _ = ann_search(ann_index, ann_index.embeddings[row], max(ann_shortlist, k), ann_nprobe, exclude=row)
+        ids, scores = rerank_exact(tfidf_matrix, row, ids, k)
+    else:
+        ids, scores = neighbors_of(neighbor_index, row)
+    mask = active[ids]
+    # Same genre semantics as recommend_movies: "crime, drama" needs both
+    if genre:
+        postings = lookup(genre_index, genre)
+        mask &= np.isin(ids, postings.rows) if postings is not None else False
+    if min_rating:
+        mask &= ratings[ids] >= min_rating
+    ids, scores = ids[mask][:top_n], scores[mask][:top_n]
+
+    if len(ids) == 0:
+        return f"No movies similar to '{title}' found for that genre and rating range."
+    return pd.DataFrame({
+        'Series_Title': titles[ids],
+        'Genre': genres[ids],
+        'IMDB_Rating': ratings[ids],
+        'Similarity': scores,
+    }, index=ids)
+
+def _similar_by_fields(title, row, genre, min_rating, top_n, field_weights):
+    unknown = set(field_weights) - set(DEFAULT_FIELD_WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    candidates = query_genre(genre_index, genre, min_rating, -1, len(active))
+    candidates = candidates[candidates != row]
+    scores = field_scores(field_blocks, row, {**DEFAULT_FIELD_WEIGHTS, **field_weights})[candidates]
+    keep = scores > 0
+    candidates, scores = candidates[keep], scores[keep]
+    if len(scores) > top_n:
+        top = np.argpartition(-scores, top_n - 1)[:top_n]
+        candidates, scores = candidates[top], scores[top]
+    order = np.argsort(-scores, kind='stable')
+    ids, scores = candidates[order], scores[order]
+
+    if len(ids) == 0:
+        return f"No movies similar to '{title}' found for that genre and rating range."
+    return pd.DataFrame({
+        'Series_Title': titles[ids],
+        'Genre': genres[ids],
+        'IMDB_Rating': ratings[ids],
+        'Similarity': scores,
+    }, index=ids)
+
+# One user's recommendation session: the mood is scored once, and the full
+# candidate ordering is materialized on the first page (a view of the genre
+# postings for positive/negative moods), so every further page is an O(k) slice.
+class RecommendationSession:
+    def __init__(self, genre=None, mood=None, rating=None):
+        self.genre = genre
+        self.rating = rating
+        self.polarity = mood_polarity(mood) if mood else 0.0
+        self.order = mood_order(self.polarity)
+        self.ids = None
+        self.version = None
+        self.cursor = 0
+
+    def next_page(self, page_size=5):
+        if self.version != catalog_version:
+            self.ids = query_genre(genre_index, self.genre, self.rating, self.order, len(active))
+            self.version = catalog_version
+        if len(self.ids) == 0:
+            return f"No movies found for genre '{self.genre}' with that rating range."
 
-    top_movies = genre_movies.head(top_n)
-    return top_movies[['Series_Title', 'Genre', 'IMDB_Rating']]
+        page = self.ids[self.cursor:self.cursor + page_size]
+        if len(page) == 0:
+            return "That's every movie matching your picks. Try another genre or rating!"
+        self.cursor += len(page)
+        return movies_df.iloc[page][['Series_Title', 'Genre', 'IMDB_Rating']]
 
 # Display movie recommendations
 def display_recommendations(recs, name):
     print(Fore.CYAN + f"\n🎥 Movie Recommendations for {name}:\n")
     for i, row in recs.iterrows():
-        print(Fore.GREEN + f"{row['Series_Title']} ({row['Genre']}) - ⭐ {row['IMDB_Rating']}")
+        print(Fore.GREEN + f"{row['Series_Title']} ({row['Genre']}) - ⭐ {row['IMDB_Rating']:.1f}")
     print()
 
 # Small processing animation
@@ -64,15 +345,40 @@ def processing_animation():
         time.sleep(0.5)
     print()
 
+# Typo-tolerant title prompt: offer the closest titles and let the user pick one
+def choose_title(typed):
+    while True:
+        options = suggest_titles(typed, 5)
+        if not options:
+            print(Fore.RED + f"No movie titled '{typed}' found in the catalog.\n")
+            return None
+        print(Fore.CYAN + "\nDid you mean:")
+        for i, option in enumerate(options, 1):
+            print(Fore.GREEN + f"  {i}. {option}")
+        choice = input(Fore.YELLOW + "Pick a number, type the title again, or 'skip': ").strip()
+        if not choice or choice.lower() == 'skip':
+            return None
+        if choice.isdigit() and 1 <= int(choice) <= len(options):
+            return options[int(choice) - 1]
+        if find_title(choice) is not None:
+            return choice
+        typed = choice
+
 # Handle AI logic
 def handle_ai(name):
+    if name in profiles:
+        recs = for_you(name, 5)
+        if not isinstance(recs, str):
+            print(Fore.CYAN + "Welcome back! Based on the movies you liked:")
+            display_recommendations(recs, name)
+
     genre = input(Fore.YELLOW + "Enter a movie genre (e.g., Action, Comedy, Drama): ").strip()
 
     mood = input(Fore.YELLOW + "How are you feeling today? (Describe your mood): ").strip()
     print(Fore.BLUE + "\nAnalyzing mood", end="", flush=True)
     processing_animation()
 
-    polarity = TextBlob(mood).sentiment.polarity
+    polarity = mood_polarity(mood) if mood else 0.0
     mood_desc = "positive 😊" if polarity > 0 else "negative 😞" if polarity < 0 else "neutral 😐"
     print(f"{Fore.GREEN}Your mood is {mood_desc} (Polarity: {polarity:.2f})\n")
 
@@ -93,12 +399,28 @@ def handle_ai(name):
     print(Fore.BLUE + f"\nFinding movies for {name}", end="", flush=True)
     processing_animation()
 
-    recs = recommend_movies(genre=genre, mood=mood, rating=rating, top_n=5)
+    session = RecommendationSession(genre=genre, mood=mood, rating=rating)
+    recs = session.next_page(5)
     if isinstance(recs, str):
         print(Fore.RED + recs + "\n")
     else:
         display_recommendations(recs, name)
 
+    # Option for "more like this" picks seeded by a movie the user enjoyed
+    seed = input(Fore.YELLOW + "\nName a movie you liked for similar picks (or 'skip'): ").strip()
+    if not seed or seed.lower() == 'skip':
+        seed = None
+    elif find_title(seed) is None:
+        seed = choose_title(seed)
+    if seed:
+        if record_like(name, seed):
+            save_profiles()
+        recs = similar_to(seed, genre=genre, min_rating=rating, top_n=5)
+        if isinstance(recs, str):
+            print(Fore.RED + recs + "\n")
+        else:
+            display_recommendations(recs, name)
+
     # Option for more recommendations
     while True:
         action = input(Fore.YELLOW + "\nWould you like more recommendations? (yes/no): ").strip().lower()
@@ -106,7 +428,7 @@ def handle_ai(name):
             print(Fore.GREEN + f"\nEnjoy your movie picks, {name}! 🍿🎬\n")
             break
         elif action == 'yes':
-            recs = recommend_movies(genre=genre, mood=mood, rating=rating, top_n=5)
+            recs = session.next_page(5)
             if isinstance(recs, str):
                 print(Fore.RED + recs + "\n")
             else:
@@ -0,0 +1,84 @@
+from collections import namedtuple
+
+import numpy as np
+
+# IVF-style index: every movie is stored in the inverted list of its closest
+# centroid; list p holds rows list_rows[list_offsets[p]:list_offsets[p+1]].
+IVFIndex = namedtuple("IVFIndex", ["embeddings", "centroids", "list_offsets", "list_rows"])
+
+
+def _normalize(x):
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return x / norms
+
+
+# Project the TF-IDF matrix to dense, L2-normalised float32 embeddings
+def embed(tfidf_matrix, dim: int = 128, seed: int = 0) -> np.ndarray:
+    from sklearn.decomposition import TruncatedSVD
+
+    dim = min(dim, tfidf_matrix.shape[1] - 1)
+    svd = TruncatedSVD(n_components=dim, random_state=seed)
+    return _normalize(svd.fit_transform(tfidf_matrix)).astype(np.float32)
+
+
+# Closest centroid for every row, scored in chunks to bound memory
+def _assign(embeddings, centroids, chunk_size=8192):
+    assign = np.empty(len(embeddings), dtype=np.int32)
+    for start in range(0, len(embeddings), chunk_size):
+        assign[start:start + chunk_size] = np.argmax(embeddings[start:start + chunk_size] @ centroids.T, axis=1)
+    return assign
+
+
+# Spherical k-means coarse quantizer (a few Lloyd iterations on a sample)
+def build_ivf_index(embeddings, n_lists: int = None, iters: int = 10,
+                    sample_size: int = 100_000, seed: int = 0) -> IVFIndex:
+    rng = np.random.default_rng(seed)
+    n = len(embeddings)
+    n_lists = n_lists or max(1, int(4 * np.sqrt(n)))
+    n_lists = min(n_lists, n)
+
+    sample = embeddings[rng.choice(n, size=min(n, max(sample_size, n_lists)), replace=False)]
+    centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+    for _ in range(iters):
+        assign = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        empty = np.bincount(assign, minlength=n_lists) == 0
+        sums[empty] = sample[rng.choice(len(sample), size=empty.sum())]  # reseed empty lists
+        centroids = _normalize(sums).astype(np.float32)
+
+    assign = _assign(embeddings, centroids)
+    list_rows = np.argsort(assign, kind="stable").astype(np.int32)
+    list_offsets = np.zeros(n_lists + 1, dtype=np.int64)
+    np.cumsum(np.bincount(assign, minlength=n_lists), out=list_offsets[1:])
+    return IVFIndex(embeddings, centroids, list_offsets, list_rows)
+
+
+# Approximate top-n neighbors of a query vector. Only the nprobe closest lists
+# are scanned: more probes give better recall at a higher latency.
+def ann_search(index: IVFIndex, query, top_n: int = 10, nprobe: int = 8, exclude: int = None):
+    nprobe = min(nprobe, len(index.centroids))
+    probe = np.argpartition(-(index.centroids @ query), nprobe - 1)[:nprobe]
+    rows = np.concatenate([index.list_rows[index.list_offsets[p]:index.list_offsets[p + 1]] for p in probe])
+    if exclude is not None:
+        rows = rows[rows != exclude]
+
+    scores = index.embeddings[rows] @ query
+    if len(rows) > top_n:
+        top = np.argpartition(-scores, top_n - 1)[:top_n]
+        rows, scores = rows[top], scores[top]
+    order = np.argsort(-scores, kind="stable")
+    return rows[order], scores[order]
+
+
+# Re-score an approximate shortlist with exact TF-IDF cosine (one sparse dot
+# over the candidates) and keep the best top_n. The SVD projection caps what
+# the embeddings alone can recall; re-ranking a wide shortlist recovers it.
+def rerank_exact(matrix, row: int, rows, top_n: int = 10):
+    scores = (matrix[rows] @ matrix[row].T).toarray().ravel().astype(np.float32)
+    if len(rows) > top_n:
+        top = np.argpartition(-scores, top_n - 1)[:top_n]
+        rows, scores = rows[top], scores[top]
+    order = np.argsort(-scores, kind="stable")
+    return rows[order], scores[order]
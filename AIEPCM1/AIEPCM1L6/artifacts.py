@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from scipy import sparse
+
+from catalog import load_columns, read_catalog_csv, save_columns
+from fields import FIELDS, FieldBlocks, build_field_blocks
+from neighbors import NeighborIndex, build_neighbor_index
+from sentiment import score_texts
+
+# Bump whenever the on-disk layout changes so stale directories are ignored
+ARTIFACT_VERSION = 4
+# Columns loaded at startup; the full typed catalog is cached under columns/
+COLUMNS = ["Series_Title", "Genre", "IMDB_Rating", "No_of_Votes", "Meta_score", "Gross", "Released_Year",
+           "Polarity", "Subjectivity"]
+
+
+# Content hash of the catalog CSV, streamed so large files are never fully in memory
+def catalog_hash(csv_path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(csv_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def artifact_dir(csv_path: str, root: str = None) -> str:
+    root = root or os.path.join(os.path.dirname(os.path.abspath(csv_path)), "artifacts")
+    return os.path.join(root, f"v{ARTIFACT_VERSION}-{catalog_hash(csv_path)}")
+
+
+# Read the typed catalog CSV and derive the text the TF-IDF space is fitted on
+def read_catalog(csv_path: str):
+    df = read_catalog_csv(csv_path)
+    df["combined_features"] = df["Genre"].astype(object).fillna("") + " " + df["Overview"]
+    return df
+
+
+# Fit TF-IDF, build the neighbor index and write every array the recommender needs.
+# Pass a dict as timings to get the seconds spent in each stage.
+def build_artifacts(df, out_dir: str, k: int = 50, timings: dict = None) -> None:
+    # Imported here so a warm start never pays for importing scikit-learn
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    tfidf = TfidfVectorizer(stop_words="english", dtype=np.float32)
+    tfidf_matrix = tfidf.fit_transform(df["combined_features"])
+    timings["tfidf_fit_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = build_neighbor_index(tfidf_matrix, k=k)
+    timings["index_build_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    blocks = build_field_blocks(df)
+    timings["fields_s"] = time.perf_counter() - start
+
+    # Overview sentiment is scored once here, never at query time
+    start = time.perf_counter()
+    polarity, subjectivity = score_texts(df["Overview"])
+    columns = df.drop(columns="combined_features").assign(Polarity=polarity, Subjectivity=subjectivity)
+    timings["sentiment_s"] = time.perf_counter() - start
+    start = time.perf_counter()
+
+    vocabulary = np.empty(len(tfidf.vocabulary_), dtype=object)
+    for term, col in tfidf.vocabulary_.items():
+        vocabulary[col] = term
+
+    arrays = {
+        "vocabulary": vocabulary.astype(str),
+        "idf": tfidf.idf_.astype(np.float32),
+        "tfidf_data": tfidf_matrix.data,
+        "tfidf_indices": tfidf_matrix.indices,
+        "tfidf_indptr": tfidf_matrix.indptr,
+        "neighbors_indptr": index.indptr,
+        "neighbors_indices": index.indices,
+        "neighbors_scores": index.scores,
+        "field_norms": blocks.norms,
+    }
+    # Per-field blocks for query-time field weighting (see fields.py)
+    for name, matrix, vocabulary, idf in zip(blocks.names, blocks.matrices, blocks.vocabularies, blocks.idfs):
+        arrays.update({
+            f"field_{name}_data": matrix.data,
+            f"field_{name}_indices": matrix.indices,
+            f"field_{name}_indptr": matrix.indptr,
+            f"field_{name}_vocabulary": vocabulary,
+            f"field_{name}_idf": idf,
+        })
+
+    # Write into a temporary sibling and rename, so readers never see a half-built directory
+    root = os.path.dirname(out_dir)
+    os.makedirs(root, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=root, prefix=".build-")
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+        save_columns(columns, os.path.join(tmp_dir, "columns"))
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump({"version": ARTIFACT_VERSION, "rows": len(df),
+                       "shape": list(tfidf_matrix.shape), "k": k}, f)
+        os.replace(tmp_dir, out_dir)
+        timings["write_s"] = time.perf_counter() - start
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.isdir(out_dir):  # another process may have won the rename
+            raise
+
+
+# Memory-map every array in an artifact directory
+def load_artifacts(out_dir: str) -> dict:
+    with open(os.path.join(out_dir, "meta.json")) as f:
+        meta = json.load(f)
+    arrays = {
+        name[:-4]: np.load(os.path.join(out_dir, name), mmap_mode="r")
+        for name in os.listdir(out_dir) if name.endswith(".npy")
+    }
+    shape = tuple(meta["shape"])
+    return {
+        "meta": meta,
+        "version": os.path.basename(out_dir),
+        "vocabulary": arrays["vocabulary"],
+        "idf": arrays["idf"],
+        "tfidf_matrix": sparse.csr_matrix(
+            (arrays["tfidf_data"], arrays["tfidf_indices"], arrays["tfidf_indptr"]), shape=shape),
+        "neighbor_index": NeighborIndex(
+            arrays["neighbors_indptr"], arrays["neighbors_indices"], arrays["neighbors_scores"]),
+        "fields": FieldBlocks(
+            list(FIELDS),
+            [sparse.csr_matrix((arrays[f"field_{name}_data"], arrays[f"field_{name}_indices"],
+                                arrays[f"field_{name}_indptr"]),
+                               shape=(shape[0], len(arrays[f"field_{name}_idf"]))) for name in FIELDS],
+            arrays["field_norms"],
+            [arrays[f"field_{name}_vocabulary"] for name in FIELDS],
+            [arrays[f"field_{name}_idf"] for name in FIELDS]),
+        "columns": load_columns(os.path.join(out_dir, "columns"), COLUMNS),
+    }
+
+
+# Load the artifacts for this catalog, rebuilding only when its content hash changes
+def load_or_build(csv_path: str, root: str = None, k: int = 50) -> dict:
+    out_dir = artifact_dir(csv_path, root)
+    if not os.path.exists(os.path.join(out_dir, "meta.json")):
+        build_artifacts(read_catalog(csv_path), out_dir, k=k)
+    return load_artifacts(out_dir)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Build step: python artifacts.py [catalog.csv]
+    path = sys.argv[1] if len(sys.argv) > 1 else "imdb_top_1000.csv"
+    artifacts = load_or_build(path)
+    print(f"Artifacts ready: {artifact_dir(path)} ({artifacts['meta']['rows']} titles)")
@@ -0,0 +1,115 @@
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import AIMovieRecommendationSystem as app
+from genre_index import query_genre
+
+QUERY_COLUMNS = ["genre", "mood", "min_rating", "top_n"]
+
+
+# Score every distinct mood text once and map the polarity back onto the queries
+def mood_orders(moods: pd.Series, mood_cache: dict) -> np.ndarray:
+    for mood in moods.dropna().unique():
+        if mood not in mood_cache:
+            mood_cache[mood] = app.mood_polarity(mood)
+    polarity = moods.map(mood_cache).fillna(0.0).to_numpy(dtype=np.float32)
+    return np.sign(polarity).astype(np.int8)
+
+
+# Recommend for a table of (genre, mood, min_rating, top_n) queries.
+# Queries sharing the same genre / rating / polarity key are answered by one
+# index lookup (for the largest top_n in the group) and then sliced.
+# Yields (query_id, row ids) in input order; pass the same caches to reuse
+# work across chunks of a larger input.
+def recommend_batch(queries: pd.DataFrame, group_cache: dict = None, mood_cache: dict = None):
+    group_cache = {} if group_cache is None else group_cache
+    mood_cache = {} if mood_cache is None else mood_cache
+    queries = queries.reindex(columns=QUERY_COLUMNS)
+
+    genres = queries["genre"].fillna("").astype(str).str.strip().str.lower()
+    ratings = pd.to_numeric(queries["min_rating"], errors="coerce").fillna(0.0).round(2)
+    top_ns = pd.to_numeric(queries["top_n"], errors="coerce").fillna(5).astype(np.int64)
+    keys = pd.DataFrame({
+        "genre": genres,
+        "rating": ratings,
+        "order": mood_orders(queries["mood"], mood_cache),
+        "top_n": top_ns,
+    }, index=queries.index)
+
+    for (genre, rating, order), group in keys.groupby(["genre", "rating", "order"], sort=False):
+        key = (genre, rating, order)
+        top_n = int(group["top_n"].max())
+        cached = group_cache.get(key)
+        if cached is None or cached[0] < top_n:
+            group_cache[key] = (top_n, query_genre(app.genre_index, genre, rating or None, order, top_n))
+
+    for query_id, genre, rating, order, top_n in keys.itertuples():
+        yield query_id, group_cache[(genre, rating, order)][1][:top_n]
+
+
+# Render one query's picks; queries in the same group share the rendering
+def _render(ids, fmt: str) -> str:
+    titles, genres, ratings = app.titles, app.genres, app.ratings
+    if fmt == "csv":
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerows(
+            (rank, titles[i], genres[i], round(float(ratings[i]), 2)) for rank, i in enumerate(ids, 1))
+        return buf.getvalue()
+    return json.dumps([
+        {"Series_Title": str(titles[i]), "Genre": str(genres[i]), "IMDB_Rating": round(float(ratings[i]), 2)}
+        for i in ids])
+
+
+# Stream results as JSON lines (one object per query) or CSV (one row per pick)
+def write_results(results, out, fmt: str = "jsonl", header: bool = True) -> int:
+    rendered = {}
+    count = 0
+    if fmt == "csv" and header:
+        out.write("query,rank,Series_Title,Genre,IMDB_Rating\n")
+
+    for query_id, ids in results:
+        count += 1
+        key = ids.tobytes()
+        text = rendered.get(key)
+        if text is None:
+            text = rendered[key] = _render(ids, fmt)
+        if fmt == "csv":
+            out.write("".join(f"{query_id},{line}\n" for line in text.splitlines()))
+        else:
+            out.write(f'{{"query": {query_id}, "recommendations": {text}}}\n')
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch movie recommendations")
+    parser.add_argument("queries", help="CSV with genre, mood, min_rating, top_n columns")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    group_cache, mood_cache = {}, {}
+    start = time.perf_counter()
+    total = 0
+    try:
+        for chunk in pd.read_csv(args.queries, chunksize=args.chunk_size):
+            results = recommend_batch(chunk, group_cache, mood_cache)
+            total += write_results(results, out, args.format, header=total == 0)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{total} queries in {elapsed:.2f}s ({total / elapsed:,.0f} queries/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from ann import ann_search, build_ivf_index, embed, rerank_exact
+from artifacts import artifact_dir, build_artifacts, read_catalog
+from neighbors import build_neighbor_index
+
+# Genres with their share of titles in the bundled IMDB catalog
+GENRE_WEIGHTS = {
+    "Drama": 724, "Comedy": 233, "Crime": 209, "Adventure": 196, "Action": 189,
+    "Thriller": 137, "Romance": 125, "Biography": 109, "Mystery": 99, "Animation": 82,
+    "Sci-Fi": 67, "Fantasy": 66, "History": 56, "Family": 56, "War": 51, "Music": 35,
+    "Horror": 32, "Western": 20, "Film-Noir": 19, "Sport": 19, "Musical": 17,
+}
+GENRES = list(GENRE_WEIGHTS)
+CERTIFICATES = ["U", "A", "UA", "R", "PG-13", "PG", "Passed", "G", ""]
+CERTIFICATE_P = [0.23, 0.2, 0.17, 0.15, 0.04, 0.04, 0.03, 0.01, 0.13]
+MOODS = ["happy", "sad", "excited and great", "tired", "ok", "awful day"]
+
+
+# Build a synthetic catalog with every column the recommender reads.
+# Titles get 1-3 genres drawn by their real frequency (listed alphabetically,
+# like IMDB). Overviews are 8-60 words following a Zipf law over a vocabulary
+# ranked differently per primary genre, so movies of the same genre share plot
+# words like real ones. Ratings, votes, gross and years follow the skewed
+# shapes of a general catalog rather than the top-1000 list.
+def synthetic_catalog(n: int, seed: int = 0, vocab_size: int = 20000) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i}" for i in range(vocab_size)])
+
+    # Weighted sampling without replacement via the Gumbel top-k trick
+    weights = np.array(list(GENRE_WEIGHTS.values()), dtype=np.float64)
+    keys = np.log(weights / weights.sum()) + rng.gumbel(size=(n, len(GENRES)))
+    picked = np.argsort(-keys, axis=1)[:, :3]
+    primary = picked[:, 0]
+    genre_counts = rng.choice([1, 2, 3], size=n, p=[0.1, 0.25, 0.65])
+    genre_names = np.array(GENRES)
+    genres = [", ".join(sorted(genre_names[row[:c]])) for row, c in zip(picked, genre_counts)]
+
+    genre_vocab = np.stack([rng.permutation(vocab_size) for _ in GENRES])
+    lengths = np.clip(rng.normal(25, 7.7, size=n).astype(int), 8, 60)
+    word_ranks = np.minimum(rng.zipf(1.3, size=(n, 60)), vocab_size) - 1
+    words = genre_vocab[primary[:, None], word_ranks]
+    overviews = [" ".join(vocab[w[:length]]) for w, length in zip(words, lengths)]
+
+    # Directors and stars: a few prolific names, a long tail of one-offs
+    def people(prefix, pool):
+        return np.char.add(prefix, (np.minimum(rng.zipf(1.5, size=n), pool) - 1).astype(str))
+
+    meta = np.clip(np.round(rng.normal(60, 17, size=n)), 1, 100)
+    meta[rng.random(n) < 0.15] = np.nan
+    gross = np.exp(rng.normal(16.5, 2.0, size=n)).astype(np.int64)
+    return pd.DataFrame({
+        "Series_Title": [f"Movie {i}" for i in range(n)],
+        "Released_Year": (2021 - np.minimum(rng.exponential(22, size=n), 100)).astype(int),
+        "Certificate": rng.choice(CERTIFICATES, size=n, p=CERTIFICATE_P),
+        "Genre": genres,
+        "IMDB_Rating": np.round(np.clip(rng.normal(6.4, 1.1, size=n), 1.0, 10.0), 1),
+        "Overview": overviews,
+        "Meta_score": meta,
+        "Director": people("Director ", max(n // 4, 1)),
+        "Star1": people("Star ", max(n, 1)),
+        "Star2": people("Star ", max(n, 1)),
+        "Star3": people("Star ", max(n, 1)),
+        "Star4": people("Star ", max(n, 1)),
+        "No_of_Votes": np.exp(rng.normal(8.5, 2.0, size=n)).astype(np.int64) + 5,
+        "Gross": np.where(rng.random(n) < 0.17, "", [f"{g:,}" for g in gross]),
+    })
+
+
+def synthetic_tfidf(n: int, seed: int = 0):
+    df = synthetic_catalog(n, seed)
+    features = df["Genre"] + " " + df["Overview"]
+    return TfidfVectorizer(stop_words="english", dtype=np.float32).fit_transform(features)
+
+
+# Peak resident set size of this process in MB (ru_maxrss is KB on Linux)
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# The build's own peak comes from tracemalloc (numpy reports its buffers to
+# it): ru_maxrss covers the whole process, so the TF-IDF fit's peak would
+# hide the build's. bound_mb is the N*k index plus one chunk x N score block.
+def _bench_neighbors(n, k, chunk_size, results):
+    matrix = synthetic_tfidf(n)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = build_neighbor_index(matrix, k=k, chunk_size=chunk_size)
+    elapsed = time.perf_counter() - start
+    _, build_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results.put({
+        "n": n,
+        "build_s": elapsed,
+        "build_peak_mb": build_peak / 2**20,
+        "bound_mb": (n * k * 8 + chunk_size * n * 4) / 2**20,
+        "peak_rss_mb": peak_rss_mb(),
+        "index_mb": (index.indptr.nbytes + index.indices.nbytes + index.scores.nbytes) / 2**20,
+    })
+
+
+# Each size runs in a fresh process so peak RSS is not polluted by earlier runs
+def bench_neighbors(sizes=(1000, 10000, 100000), k=50, chunk_size=32):
+    ctx = multiprocessing.get_context("spawn")
+    rows = []
+    for n in sizes:
+        results = ctx.Queue()
+        proc = ctx.Process(target=_bench_neighbors, args=(n, k, chunk_size, results))
+        proc.start()
+        rows.append(results.get())
+        proc.join()
+    return rows
+
+
+# Recall@k of the approximate search against the exact TF-IDF cosine scorer,
+# with per-query latency for both, at several nprobe settings
+def bench_ann(n=100000, dim=128, nprobes=(1, 2, 4, 8, 16, 32), k=10, n_queries=200, seed=0, shortlist=500):
+    matrix = synthetic_tfidf(n, seed).tocsr()
+    start = time.perf_counter()
+    embeddings = embed(matrix, dim, seed)
+    embed_s = time.perf_counter() - start
+    start = time.perf_counter()
+    index = build_ivf_index(embeddings, seed=seed)
+    build_s = time.perf_counter() - start
+
+    queries = np.random.default_rng(seed).choice(n, size=n_queries, replace=False)
+
+    # Exact top-k of a scoring function, timed per query
+    def exact_top_k(score):
+        found, times = [], []
+        for q in queries:
+            start = time.perf_counter()
+            scores = score(q)
+            scores[q] = -np.inf
+            found.append(set(np.argpartition(-scores, k - 1)[:k].tolist()))
+            times.append(time.perf_counter() - start)
+        return found, times
+
+    # "recall" is against exact TF-IDF cosine; "index_recall" against a flat
+    # scan of the same embeddings, which isolates the IVF loss from the SVD loss
+    exact, exact_times = exact_top_k(lambda q: (matrix @ matrix[q].T).toarray().ravel())
+    flat, flat_times = exact_top_k(lambda q: embeddings @ embeddings[q])
+
+    def summary(mode, nprobe, found, times):
+        return {"mode": mode, "nprobe": nprobe,
+                "recall": sum(len(f & t) for f, t in zip(found, exact)) / (k * n_queries),
+                "index_recall": sum(len(f & t) for f, t in zip(found, flat)) / (k * n_queries),
+                "p50_ms": 1000 * np.percentile(times, 50),
+                "p99_ms": 1000 * np.percentile(times, 99)}
+
+    rows = [summary("exact", None, exact, exact_times), summary("flat", None, flat, flat_times)]
+    for nprobe in nprobes:
+        found, times = [], []
+        for q in queries:
+            start = time.perf_counter()
+            ids, _ = ann_search(index, embeddings[q], k, nprobe, exclude=q)
+            times.append(time.perf_counter() - start)
+            found.append(set(ids.tolist()))
+        rows.append(summary("ivf", nprobe, found, times))
+    # The same probes, with a `shortlist`-wide candidate set re-ranked by exact cosine
+    for nprobe in nprobes:
+        found, times = [], []
+        for q in queries:
+            start = time.perf_counter()
+            ids, _ = ann_search(index, embeddings[q], shortlist, nprobe, exclude=q)
+            ids, _ = rerank_exact(matrix, q, ids, k)
+            times.append(time.perf_counter() - start)
+            found.append(set(ids.tolist()))
+        rows.append(summary("rerank", nprobe, found, times))
+    return {"n": n, "dim": dim, "n_lists": len(index.centroids),
+            "embed_s": embed_s, "build_s": build_s, "rows": rows}
+
+
+def _percentiles(times):
+    ms = 1000 * np.asarray(times)
+    return {"p50_ms": float(np.percentile(ms, 50)), "p99_ms": float(np.percentile(ms, 99))}
+
+
+# One end-to-end run at size n, in its own process: write the CSV, time the
+# typed load, TF-IDF fit and neighbor index build, start the recommender on the
+# fresh artifacts, then time the genre/rating and similarity paths per query.
+def _bench_suite(n, n_queries, seed, workdir, results):
+    csv_path = os.path.join(workdir, f"catalog-{n}.csv")
+    synthetic_catalog(n, seed).to_csv(csv_path, index=False)
+    row = {"n": n, "csv_mb": os.path.getsize(csv_path) / 2**20}
+
+    start = time.perf_counter()
+    df = read_catalog(csv_path)
+    row["load_s"] = time.perf_counter() - start
+
+    timings = {}
+    build_artifacts(df, artifact_dir(csv_path), timings=timings)
+    row.update(timings)
+    del df
+
+    # Warm start, as a restarted service would see it
+    os.environ["MOVIE_CATALOG"] = csv_path
+    start = time.perf_counter()
+    import AIMovieRecommendationSystem as app
+    row["startup_s"] = time.perf_counter() - start
+    row["rss_after_startup_mb"] = peak_rss_mb()
+
+    rng = np.random.default_rng(seed + 1)
+    genre_queries = [(GENRES[rng.integers(len(GENRES))], MOODS[rng.integers(len(MOODS))],
+                      [None, 6.0, 7.0, 8.0][rng.integers(4)]) for _ in range(n_queries)]
+    title_queries = [f"Movie {i}" for i in rng.integers(n, size=n_queries)]
+
+    # The first calls pay for one-off caches, so they are not counted
+    for genre, mood, rating in genre_queries[:10]:
+        app.recommend_movies(genre, mood, rating)
+    for title in title_queries[:10]:
+        app.similar_to(title)
+
+    # Uncached: the result cache is emptied before every query, so this times
+    # the index path. The cached numbers repeat the queries once every key
+    # has been stored, so each is a hit.
+    times = []
+    for genre, mood, rating in genre_queries:
+        app.result_cache.clear()
+        start = time.perf_counter()
+        app.recommend_movies(genre, mood, rating)
+        times.append(time.perf_counter() - start)
+    row["recommend"] = _percentiles(times)
+
+    for genre, mood, rating in genre_queries:
+        app.recommend_movies(genre, mood, rating)
+    times = []
+    for genre, mood, rating in genre_queries:
+        start = time.perf_counter()
+        app.recommend_movies(genre, mood, rating)
+        times.append(time.perf_counter() - start)
+    row["recommend_cached"] = _percentiles(times)
+
+    times = []
+    for title in title_queries:
+        start = time.perf_counter()
+        app.similar_to(title)
+        times.append(time.perf_counter() - start)
+    row["similar"] = _percentiles(times)
+
+    row["peak_rss_mb"] = peak_rss_mb()
+    results.put(row)
+
+
+# Full pipeline at each size. Every size runs in a fresh process so load and
+# peak RSS are not polluted by earlier sizes. The exact neighbor index is
+# O(n^2), so sizes toward 1M take hours on one core.
+def bench_suite(sizes=(10000, 100000), n_queries=1000, seed=0, workdir=None):
+    ctx = multiprocessing.get_context("spawn")
+    rows = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for n in sizes:
+            results = ctx.Queue()
+            proc = ctx.Process(target=_bench_suite, args=(n, n_queries, seed, tmp, results))
+            proc.start()
+            rows.append(results.get())
+            proc.join()
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "queries": n_queries,
+            "seed": seed,
+        },
+        "results": rows,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Movie recommender benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("neighbors", help="top-k neighbor index build time and peak RSS")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    p.add_argument("--k", type=int, default=50)
+    p.add_argument("--chunk-size", type=int, default=32)
+
+    p = sub.add_parser("ann", help="approximate search recall@k vs latency")
+    p.add_argument("--size", type=int, default=100000)
+    p.add_argument("--dim", type=int, default=128)
+    p.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    p.add_argument("--k", type=int, default=10)
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--shortlist", type=int, default=500, help="candidates re-ranked by exact cosine")
+
+    p = sub.add_parser("suite", help="load, fit, index build, RSS and query latency; writes JSON")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    p.add_argument("--queries", type=int, default=1000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--workdir", default=None, help="where the synthetic CSVs and artifacts go")
+    p.add_argument("--out", default="benchmark-results.json")
+    args = parser.parse_args()
+
+    if args.command == "neighbors":
+        print(f"{'titles':>8} {'build (s)':>10} {'build peak (MB)':>16} {'N*k + chunk*N (MB)':>19} "
+              f"{'process RSS (MB)':>17} {'index (MB)':>11}")
+        for row in bench_neighbors(args.sizes, args.k, args.chunk_size):
+            print(f"{row['n']:>8} {row['build_s']:>10.2f} {row['build_peak_mb']:>16.1f} {row['bound_mb']:>19.1f} "
+                  f"{row['peak_rss_mb']:>17.1f} {row['index_mb']:>11.1f}")
+    elif args.command == "ann":
+        result = bench_ann(args.size, args.dim, args.nprobe, args.k, args.queries, shortlist=args.shortlist)
+        print(f"{result['n']} titles, {result['dim']}-d embeddings, {result['n_lists']} lists "
+              f"(SVD {result['embed_s']:.1f}s, IVF build {result['build_s']:.1f}s)")
+        print(f"{'mode':>6} {'nprobe':>7} {f'recall@{args.k}':>10} {'index recall':>13} "
+              f"{'p50 (ms)':>9} {'p99 (ms)':>9}")
+        for row in result["rows"]:
+            print(f"{row['mode']:>6} {row['nprobe'] or '-':>7} {row['recall']:>10.3f} "
+                  f"{row['index_recall']:>13.3f} {row['p50_ms']:>9.3f} {row['p99_ms']:>9.3f}")
+    elif args.command == "suite":
+        report = bench_suite(args.sizes, args.queries, args.seed, args.workdir)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"{'titles':>8} {'load (s)':>9} {'fit (s)':>8} {'index (s)':>10} {'peak RSS (MB)':>14} "
+              f"{'genre p50/p99 (ms)':>19} {'cached p50/p99 (ms)':>20} {'similar p50/p99 (ms)':>21}")
+        for row in report["results"]:
+            rec, hit, sim = row["recommend"], row["recommend_cached"], row["similar"]
+            print(f"{row['n']:>8} {row['load_s']:>9.2f} {row['tfidf_fit_s']:>8.2f} {row['index_build_s']:>10.2f} "
+                  f"{row['peak_rss_mb']:>14.1f} {rec['p50_ms']:>9.3f}/{rec['p99_ms']:<9.3f} "
+                  f"{hit['p50_ms']:>9.3f}/{hit['p99_ms']:<10.3f} "
+                  f"{sim['p50_ms']:>10.3f}/{sim['p99_ms']:<10.3f}")
+        print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
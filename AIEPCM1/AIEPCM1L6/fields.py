@@ -0,0 +1,98 @@
+from collections import Counter, namedtuple
+
+import numpy as np
+from scipy import sparse
+
+from incremental import build_analyzer, transform_frozen
+
+# The text fields the catalog is vectorized on, each in its own TF-IDF block
+FIELDS = ["genre", "overview", "director", "cast"]
+DEFAULT_FIELD_WEIGHTS = {"genre": 1.0, "overview": 1.0, "director": 0.5, "cast": 0.5}
+
+# One L2-normalised TF-IDF matrix per field (same rows as the catalog), with
+# norms[:, b] the norm of every row in block b: 1, or 0 when the field is empty.
+# Each block keeps its vocabulary and idf so new titles can be vectorized later;
+# term_ids (term -> column per block) is built on the first update and reused.
+FieldBlocks = namedtuple("FieldBlocks", ["names", "matrices", "norms", "vocabularies", "idfs", "term_ids"],
+                         defaults=(None,))
+
+
+# Genre, director and cast are lists of names: every name is one token
+def _names(value):
+    return [name.strip().lower() for name in str(value).split(",") if name.strip()]
+
+
+def field_analyzer(name):
+    return build_analyzer() if name == "overview" else _names
+
+
+# The document each field is built from, for every row of a catalog frame
+def field_documents(df) -> dict:
+    def col(name):
+        return df[name].astype(object).fillna("").astype(str) if name in df else [""] * len(df)
+
+    stars = [col(f"Star{i}") for i in range(1, 5)]
+    return {
+        "genre": list(col("Genre")),
+        "overview": list(col("Overview")),
+        "director": list(col("Director")),
+        "cast": [", ".join(names) for names in zip(*stars)],
+    }
+
+
+def block_norms(matrices) -> np.ndarray:
+    return np.stack([np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel()) for m in matrices],
+                    axis=1).astype(np.float32)
+
+
+def build_field_blocks(df) -> FieldBlocks:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    documents = field_documents(df)
+    matrices, vocabularies, idfs = [], [], []
+    for name in FIELDS:
+        tfidf = TfidfVectorizer(analyzer=field_analyzer(name), dtype=np.float32)
+        try:
+            matrices.append(tfidf.fit_transform(documents[name]).tocsr())
+            vocabulary = np.empty(len(tfidf.vocabulary_), dtype=object)
+            for term, col in tfidf.vocabulary_.items():
+                vocabulary[col] = term
+            vocabularies.append(vocabulary.astype(str))
+            idfs.append(tfidf.idf_.astype(np.float32))
+        except ValueError:  # the field is empty for every row
+            matrices.append(sparse.csr_matrix((len(df), 0), dtype=np.float32))
+            vocabularies.append(np.empty(0, dtype=str))
+            idfs.append(np.empty(0, dtype=np.float32))
+    return FieldBlocks(list(FIELDS), matrices, block_norms(matrices), vocabularies, idfs)
+
+
+# Vectorize rows appended to the catalog in every block's frozen vocabulary.
+# Only the new rows are vectorized and normed.
+def extend_field_blocks(blocks: FieldBlocks, df) -> FieldBlocks:
+    term_ids = blocks.term_ids
+    if term_ids is None:
+        term_ids = [{term: col for col, term in enumerate(vocabulary)} for vocabulary in blocks.vocabularies]
+    documents = field_documents(df)
+    matrices, extras = [], []
+    for name, matrix, terms, idf in zip(blocks.names, blocks.matrices, term_ids, blocks.idfs):
+        extra = transform_frozen(documents[name], terms, idf, field_analyzer(name), Counter()).tocsr()
+        extras.append(extra)
+        matrices.append(sparse.vstack([matrix, extra], format="csr"))
+    norms = np.concatenate([blocks.norms, block_norms(extras)])
+    return blocks._replace(matrices=matrices, norms=norms, term_ids=term_ids)
+
+
+# Cosine similarity of `row` to every title in the space where block b is
+# scaled by weights[b]: the block dot products d_b and norms n_b combine as
+#   sum(w_b^2 d_b) / (sqrt(sum(w_b^2 n_b(row)^2)) * sqrt(sum(w_b^2 n_b^2)))
+# so any weighting is answered from the same blocks, without a rebuild.
+def field_scores(blocks: FieldBlocks, row: int, weights: dict) -> np.ndarray:
+    w2 = np.array([weights.get(name, 0.0) ** 2 for name in blocks.names], dtype=np.float32)
+    dots = np.zeros(blocks.norms.shape[0], dtype=np.float32)
+    for weight, matrix in zip(w2, blocks.matrices):
+        if weight:
+            dots += weight * (matrix @ matrix[row].T).toarray().ravel()
+
+    squared = blocks.norms * blocks.norms
+    denom = np.sqrt(squared @ w2) * np.sqrt(squared[row] @ w2)
+    return np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
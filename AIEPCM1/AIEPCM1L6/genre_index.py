@@ -0,0 +1,130 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Row ids of every movie in a genre, sorted by rating (ties in reverse catalog
+# order, so reading the slice backwards gives highest rated first, catalog order
+# among ties), plus the matching sorted ratings to bisect on.
+Postings = namedtuple("Postings", ["rows", "ratings"])
+
+# genre -> Postings, the catalog ratings needed to merge postings later, and
+# memoized postings for partial / multi-genre queries
+GenreIndex = namedtuple("GenreIndex", ["postings", "ratings", "merged"])
+
+ALL_GENRES = ""
+
+
+def _postings(rows, ratings) -> Postings:
+    rows = np.asarray(rows, dtype=np.int32)
+    order = np.lexsort((-rows, ratings[rows]))
+    rows = rows[order]
+    return Postings(rows, np.ascontiguousarray(ratings[rows]))
+
+
+# Parse the comma separated Genre column once into genre -> postings
+def build_genre_index(genres, ratings) -> GenreIndex:
+    rows_by_genre = {}
+    for row, value in enumerate(genres):
+        for genre in value.split(","):
+            genre = genre.strip().lower()
+            if genre:
+                rows_by_genre.setdefault(genre, []).append(row)
+
+    postings = {genre: _postings(rows, ratings) for genre, rows in rows_by_genre.items()}
+    postings[ALL_GENRES] = _postings(np.arange(len(genres)), ratings)
+    return GenreIndex(postings, ratings, {})
+
+
+# Canonical form of a genre query: "Crime ,DRAMA" -> "crime, drama"
+def normalize_genre(genre) -> str:
+    return ", ".join(part.strip() for part in (genre or ALL_GENRES).lower().split(","))
+
+
+# Postings for a genre query. Like the old str.contains filter, every query
+# matches each genre containing it, whole genre names included ("sci" ->
+# "sci-fi", "music" -> "music" and "musical"). Unlike it, "crime, drama"
+# matches movies in both genres. Merged postings are memoized in the index.
+def lookup(index: GenreIndex, genre) -> Postings:
+    key = normalize_genre(genre)
+    if key == ALL_GENRES:
+        return index.postings[ALL_GENRES]
+    postings = index.merged.get(key)
+    if postings is not None:
+        return postings
+
+    rows = None
+    for part in key.split(", "):
+        matches = [p.rows for name, p in index.postings.items() if name and part in name]
+        if not matches:
+            return None
+        part_rows = np.unique(np.concatenate(matches))
+        rows = part_rows if rows is None else np.intersect1d(rows, part_rows)
+
+    postings = index.merged[key] = _postings(rows, index.ratings)
+    return postings
+
+
+def _genres_of(value):
+    return {genre.strip().lower() for genre in value.split(",") if genre.strip()}
+
+
+# Incremental updates: only the postings of the genres the rows belong to are
+# rebuilt, and memoized merged postings are dropped.
+def add_to_genre_index(index: GenreIndex, rows, genres, ratings) -> GenreIndex:
+    added = {}
+    for row, value in zip(rows, genres):
+        for genre in _genres_of(value) | {ALL_GENRES}:
+            added.setdefault(genre, []).append(row)
+
+    # New rows have the largest ids, so they go before equal ratings (side="left")
+    postings = dict(index.postings)
+    for genre, new_rows in added.items():
+        new = _postings(new_rows, ratings)
+        if genre not in postings:
+            postings[genre] = new
+            continue
+        old = postings[genre]
+        pos = np.searchsorted(old.ratings, new.ratings, side="left")
+        postings[genre] = Postings(np.insert(old.rows, pos, new.rows), np.insert(old.ratings, pos, new.ratings))
+    return GenreIndex(postings, ratings, {})
+
+
+def remove_from_genre_index(index: GenreIndex, rows, genres) -> GenreIndex:
+    removed = {}
+    for row, value in zip(rows, genres):
+        for genre in _genres_of(value) | {ALL_GENRES}:
+            removed.setdefault(genre, []).append(row)
+
+    postings = dict(index.postings)
+    for genre, old_rows in removed.items():
+        keep = ~np.isin(postings[genre].rows, old_rows)
+        postings[genre] = Postings(postings[genre].rows[keep], postings[genre].ratings[keep])
+        if not len(postings[genre].rows) and genre != ALL_GENRES:
+            del postings[genre]
+    return GenreIndex(postings, index.ratings, {})
+
+
+# Row ids for a genre / minimum rating query.
+# order > 0: highest rated first, order < 0: lowest rated first, 0: catalog order.
+# The rating threshold is a binary search over the sorted ratings, so ordered
+# queries cost O(log n + top_n). The threshold is cast to the ratings dtype
+# first: searchsorted would compare float32 ratings against it as float64,
+# where float32(7.6) < 7.6 drops every film rated exactly 7.6.
+def query_genre(index: GenreIndex, genre=None, rating=None, order: int = 0, top_n: int = 5):
+    postings = lookup(index, genre)
+    if postings is None:
+        return np.empty(0, dtype=np.int32)
+
+    start = 0
+    if rating:
+        start = int(np.searchsorted(postings.ratings, postings.ratings.dtype.type(rating), side="left"))
+    rows = postings.rows
+    if order > 0:
+        return rows[max(start, len(rows) - top_n):][::-1]
+    if order < 0:
+        return rows[start:start + top_n]
+
+    rows = rows[start:]
+    if len(rows) > top_n:
+        rows = np.partition(rows, top_n - 1)[:top_n]
+    return np.sort(rows)
@@ -0,0 +1,42 @@
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+
+# Tokenizer identical to the one TfidfVectorizer(stop_words='english') uses
+def build_analyzer():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    return TfidfVectorizer(stop_words="english").build_analyzer()
+
+
+# TF-IDF vectors for new documents in the frozen vocabulary of the fitted space:
+# raw term counts * fitted idf, L2-normalised, as TfidfVectorizer.transform does.
+# Terms the vocabulary has never seen are counted per document in oov_doc_freq,
+# so a later full refit can tell which new terms are worth adding.
+def transform_frozen(texts, term_ids: dict, idf, analyzer, oov_doc_freq: Counter):
+    data, indices, indptr = [], [], [0]
+    for text in texts:
+        counts, oov = Counter(), set()
+        for token in analyzer(text):
+            col = term_ids.get(token)
+            if col is None:
+                oov.add(token)
+            else:
+                counts[col] += 1
+        oov_doc_freq.update(oov)
+
+        cols = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts)) * idf[cols]
+        norm = np.linalg.norm(values)
+        order = np.argsort(cols)
+        indices.append(cols[order])
+        data.append(values[order] / (norm or 1))
+        indptr.append(indptr[-1] + len(cols))
+
+    return sparse.csr_matrix(
+        (np.concatenate(data) if data else np.empty(0, np.float32),
+         np.concatenate(indices) if indices else np.empty(0, np.int32),
+         np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(idf)))
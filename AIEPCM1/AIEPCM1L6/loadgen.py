@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import random
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+
+GENRES = ["Drama", "Action", "Comedy", "Crime", "Sci-Fi", "Adventure", "Romance", "Thriller"]
+MOODS = ["happy", "sad", "excited and great", "tired", "ok", "awful day"]
+TITLES = ["The Dark Knight", "Inception", "The Godfather", "Toy Story", "Pulp Fiction", "Interstellar"]
+
+
+# Mix of /recommend and /similar requests, as real traffic would send
+def random_target(rng):
+    if rng.random() < 0.7:
+        params = {"genre": rng.choice(GENRES), "mood": rng.choice(MOODS), "top_n": 5}
+        if rng.random() < 0.5:
+            params["rating"] = rng.choice([7.8, 8.0, 8.5])
+        return "/recommend?" + urlencode(params)
+    return "/similar?" + urlencode({"title": rng.choice(TITLES), "top_n": 5})
+
+
+async def _read_response(reader):
+    length = 0
+    status = int((await reader.readline()).split()[1])
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        if key.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+# One keep-alive connection sending requests back to back until the quota is used
+async def worker(host, port, quota, latencies, errors, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while quota[0] > 0:
+            quota[0] -= 1
+            request = f"GET {random_target(rng)} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1")
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status >= 500:
+                errors[0] += 1
+    finally:
+        writer.close()
+
+
+async def run(host, port, requests, concurrency, seed):
+    latencies, errors, quota = [], [0], [requests]
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(host, port, quota, latencies, errors, seed + i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    print(f"{len(latencies)} requests, concurrency {concurrency}, {errors[0]} server errors")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} req/s")
+    print(f"latency: p50 {np.percentile(ms, 50):.2f} ms, p99 {np.percentile(ms, 99):.2f} ms, "
+          f"max {ms.max():.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args.host, args.port, args.requests, args.concurrency, args.seed))
+
+
+if __name__ == "__main__":
+    main()
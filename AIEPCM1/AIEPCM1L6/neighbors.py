@@ -0,0 +1,94 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Top-k neighbor index stored as ragged CSR arrays:
+# row i's neighbors are indices[indptr[i]:indptr[i+1]], best first,
+# with their cosine scores in the same slice of scores.
+# Rows changed by incremental updates live in the patched dict
+# (row -> (indices, scores)) and take precedence over the CSR arrays.
+NeighborIndex = namedtuple("NeighborIndex", ["indptr", "indices", "scores", "patched"], defaults=(None,))
+
+
+def build_neighbor_index(matrix, k: int = 50, chunk_size: int = 32) -> NeighborIndex:
+    # TF-IDF rows are L2-normalised, so a dot product is the cosine similarity.
+    # Rows are scored chunk by chunk, so peak memory is O(N*k + chunk_size*N)
+    # instead of the dense N x N matrix.
+    n = matrix.shape[0]
+    k = max(0, min(k, n - 1))
+    matrix = matrix.tocsr()
+
+    counts = np.zeros(n, dtype=np.int64)
+    indices = np.empty((n, k), dtype=np.int32)
+    scores = np.empty((n, k), dtype=np.float32)
+
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        # sparse x dense is much faster than sparse x sparse once the output is dense
+        block = np.ascontiguousarray((matrix @ matrix[start:stop].T.toarray()).T, dtype=np.float32)
+        rows = np.arange(stop - start)
+        block[rows, rows + start] = -np.inf  # a movie is not its own neighbor
+        if k == 0:
+            continue
+
+        top = np.argpartition(block, n - k, axis=1)[:, n - k:]
+        top_scores = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        indices[start:stop] = top
+        scores[start:stop] = top_scores
+        # Drop neighbors that share no terms at all, which makes the rows ragged
+        counts[start:stop] = (top_scores > 0).sum(axis=1)
+
+    keep = np.arange(k) < counts[:, None]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return NeighborIndex(indptr, indices[keep], scores[keep])
+
+
+def neighbors_of(index: NeighborIndex, row: int):
+    if index.patched and row in index.patched:
+        return index.patched[row]
+    start, stop = index.indptr[row], index.indptr[row + 1]
+    return index.indices[start:stop], index.scores[start:stop]
+
+
+# Add freshly appended rows of matrix to the index without rebuilding it.
+# The new rows get full neighbor lists, and an existing row is only patched
+# when one of the new rows beats the worst neighbor it already has.
+def patch_neighbor_index(index: NeighborIndex, matrix, rows, k: int = 50) -> NeighborIndex:
+    matrix = matrix.tocsr()
+    rows = np.asarray(rows, dtype=np.int32)
+    patched = dict(index.patched or {})
+    block = np.ascontiguousarray((matrix @ matrix[rows].T.toarray()).T, dtype=np.float32)
+    block[np.arange(len(rows)), rows] = -np.inf
+
+    # Score a row must beat to enter each existing neighbor list (0 while it has room)
+    n_base = len(index.indptr) - 1
+    counts = np.diff(index.indptr)
+    floor = np.zeros(matrix.shape[0], dtype=np.float32)
+    full = counts >= k
+    floor[:n_base][full] = index.scores[index.indptr[1:][full] - 1]
+    for row, (ids, scores) in patched.items():
+        floor[row] = scores[-1] if len(ids) >= k else 0
+
+    for j, row in enumerate(rows):
+        top = np.argsort(-block[j], kind="stable")[:k]
+        top = top[block[j, top] > 0]
+        patched[row] = (top.astype(np.int32), block[j, top])
+
+    index = index._replace(patched=patched)
+    new_rows = set(rows.tolist())
+    for j, row in enumerate(rows):
+        for other in np.nonzero(block[j] > floor)[0]:
+            if other in new_rows:
+                continue
+            ids, scores = neighbors_of(index, other)
+            pos = int(np.searchsorted(-scores, -block[j, other], side="right"))
+            ids = np.insert(ids, pos, row)[:k]
+            scores = np.insert(scores, pos, block[j, other])[:k]
+            patched[other] = (ids, scores)
+            floor[other] = scores[-1] if len(ids) >= k else 0
+    return index
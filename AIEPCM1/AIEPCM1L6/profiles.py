@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from scipy import sparse
+
+
+# Per-user taste profiles. A profile is the sum of the TF-IDF rows of every
+# title the user liked, kept as a term -> weight dict, so recording a like
+# costs O(nnz) of that one row. Scoring uses the sum scaled to unit length,
+# which points the same way as the centroid of the liked titles.
+class ProfileStore:
+    def __init__(self):
+        self.sums = {}    # user -> {term column: summed weight}
+        self.likes = {}   # user -> set of liked rows
+
+    def __contains__(self, user):
+        return bool(self.likes.get(user))
+
+    def record_like(self, user, row, matrix):
+        liked = self.likes.setdefault(user, set())
+        if row in liked:
+            return False
+        liked.add(row)
+        sums = self.sums.setdefault(user, {})
+        start, stop = matrix.indptr[row], matrix.indptr[row + 1]
+        for term, weight in zip(matrix.indices[start:stop].tolist(), matrix.data[start:stop].tolist()):
+            sums[term] = sums.get(term, 0.0) + weight
+        return True
+
+    def remove_like(self, user, row, matrix):
+        liked = self.likes.get(user, set())
+        if row not in liked:
+            return False
+        liked.discard(row)
+        sums = self.sums[user]
+        start, stop = matrix.indptr[row], matrix.indptr[row + 1]
+        for term, weight in zip(matrix.indices[start:stop].tolist(), matrix.data[start:stop].tolist()):
+            left = sums.get(term, 0.0) - weight
+            if left > 1e-6:
+                sums[term] = left
+            else:
+                sums.pop(term, None)
+        return True
+
+    # Raw (unnormalized) sums of `users` as CSR arrays
+    def profile_sums(self, users):
+        sums = [self.sums.get(user, {}) for user in users]
+        indptr = np.zeros(len(users) + 1, dtype=np.int64)
+        np.cumsum([len(s) for s in sums], out=indptr[1:])
+        indices = np.fromiter((t for s in sums for t in s), dtype=np.int32, count=indptr[-1])
+        data = np.fromiter((w for s in sums for w in s.values()), dtype=np.float64, count=indptr[-1])
+        return indptr, indices, data
+
+    # Unit-length profiles of `users` as a CSR matrix, one row per user
+    def profile_matrix(self, users, n_terms):
+        indptr, indices, data = self.profile_sums(users)
+        lengths = np.diff(indptr)
+        norms = np.sqrt(np.bincount(np.repeat(np.arange(len(users)), lengths), weights=data * data,
+                                    minlength=len(users)))
+        norms[norms == 0] = 1.0
+        data = (data / np.repeat(norms, lengths)).astype(np.float32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(users), n_terms))
+
+    # `version` ties the stored row ids and term columns to one catalog build;
+    # `titles` (row -> title) lets a later build re-resolve the likes
+    def save(self, path, version=None, titles=None):
+        users = list(self.likes)
+        matrix = self.profile_sums(users)
+        likes_indptr = np.zeros(len(users) + 1, dtype=np.int64)
+        np.cumsum([len(self.likes[u]) for u in users], out=likes_indptr[1:])
+        likes = np.fromiter((r for u in users for r in sorted(self.likes[u])), dtype=np.int32,
+                            count=likes_indptr[-1])
+        extra = {} if titles is None else {"like_titles": np.asarray(titles, dtype=str)[likes]}
+        tmp = f"{path}.tmp.npz"
+        np.savez(tmp, users=np.array(users, dtype=str), indptr=matrix[0], indices=matrix[1],
+                 data=matrix[2], likes_indptr=likes_indptr, likes=likes,
+                 version=np.array("" if version is None else version), **extra)
+        os.replace(tmp, path)
+
+    # A store saved against another catalog version is not used as is: its
+    # profiles are rebuilt from the liked titles still found by `find_row`
+    # (when titles were saved and `find_row`/`matrix` are given), else dropped.
+    @classmethod
+    def load(cls, path, version=None, find_row=None, matrix=None):
+        store = cls()
+        with np.load(path) as f:
+            users = f["users"].tolist()
+            likes_indptr, likes = f["likes_indptr"], f["likes"]
+            saved = str(f["version"]) if "version" in f else ""
+            if version is not None and saved != version:
+                if "like_titles" in f and find_row is not None and matrix is not None:
+                    like_titles = f["like_titles"].tolist()
+                    for i, user in enumerate(users):
+                        for title in like_titles[likes_indptr[i]:likes_indptr[i + 1]]:
+                            row = find_row(title)
+                            if row is not None:
+                                store.record_like(user, row, matrix)
+                return store
+            indptr, indices, data = f["indptr"], f["indices"], f["data"]
+            for i, user in enumerate(users):
+                a, b = indptr[i], indptr[i + 1]
+                store.sums[user] = dict(zip(indices[a:b].tolist(), data[a:b].tolist()))
+                store.likes[user] = set(likes[likes_indptr[i]:likes_indptr[i + 1]].tolist())
+        return store
+
+
+# "For you" lists: users are scored chunk by chunk with one sparse x dense
+# product against the whole catalog (chunk_size x N scores at a time), liked
+# and removed titles are masked out, and the top_n are picked with argpartition.
+# Yields (user, row ids, scores), best first.
+def score_users(store: ProfileStore, users, matrix, top_n: int = 10, chunk_size: int = 64, active=None):
+    users = list(users)
+    n = matrix.shape[0]
+    matrix = matrix.tocsr()
+    for start in range(0, len(users), chunk_size):
+        chunk = users[start:start + chunk_size]
+        profiles = store.profile_matrix(chunk, matrix.shape[1])
+        block = np.ascontiguousarray((matrix @ profiles.T.toarray()).T, dtype=np.float32)
+        if active is not None:
+            block[:, ~active[:n]] = -np.inf
+        for i, user in enumerate(chunk):
+            liked = [row for row in store.likes.get(user, ()) if row < n]
+            block[i, liked] = -np.inf
+
+        k = min(top_n, n)
+        if k == 0:
+            for user in chunk:
+                yield user, np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+            continue
+        top = np.argpartition(block, n - k, axis=1)[:, n - k:]
+        top_scores = np.take_along_axis(block, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        for i, user in enumerate(chunk):
+            keep = top_scores[i] > 0
+            yield user, top[i][keep].astype(np.int32), top_scores[i][keep]
+
+
+# Nightly job: fold a like log (user,title CSV) into the stored profiles,
+# then write every user's "for you" list as JSON lines
+def main():
+    parser = argparse.ArgumentParser(description="Per-user 'for you' recommendations")
+    parser.add_argument("likes", nargs="?", help="CSV with user and title columns to record first")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--store", default=os.environ.get("MOVIE_PROFILES", "profiles.npz"))
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    import pandas as pd
+    import AIMovieRecommendationSystem as app
+
+    store = (ProfileStore.load(args.store, app.catalog_version, app.find_title, app.tfidf_matrix)
+             if os.path.exists(args.store) else ProfileStore())
+    if args.likes:
+        likes = pd.read_csv(args.likes, dtype=str).dropna(subset=["user", "title"])
+        rows = {title: app.find_title(title) for title in likes["title"].unique()}
+        unknown = 0
+        for user, title in zip(likes["user"], likes["title"]):
+            row = rows[title]
+            if row is None:
+                unknown += 1
+            else:
+                store.record_like(user, row, app.tfidf_matrix)
+        store.save(args.store, app.catalog_version, app.titles)
+        print(f"Recorded {len(likes) - unknown} likes ({unknown} unknown titles)", file=sys.stderr)
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    start = time.perf_counter()
+    users = [user for user in store.likes if user in store]
+    try:
+        for user, ids, scores in score_users(store, users, app.tfidf_matrix, args.top_n,
+                                             args.chunk_size, app.active):
+            out.write(json.dumps({"user": user, "recommendations": [
+                {"Series_Title": str(app.titles[i]), "Genre": str(app.genres[i]),
+                 "IMDB_Rating": round(float(app.ratings[i]), 2), "Score": round(float(s), 4)}
+                for i, s in zip(ids, scores)]}) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(users)} users in {elapsed:.2f}s ({len(users) / max(elapsed, 1e-9):,.0f} users/s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Normalized ranking signals: matrix[i] is signal names[i] for every movie,
+# scaled to [0, 1] with the catalog-wide (lo, hi) kept in stats so rows added
+# later are scaled the same way.
+Signals = namedtuple("Signals", ["names", "matrix", "stats"])
+
+SIGNAL_COLUMNS = ["IMDB_Rating", "No_of_Votes", "Meta_score", "Gross", "Released_Year"]
+DEFAULT_WEIGHTS = {
+    "rating": 1.0,
+    "votes": 0.3,
+    "meta": 0.3,
+    "gross": 0.1,
+    "recency": 0.0,
+    "similarity": 1.0,   # only used when a seed title is given
+    "mood": 0.5,         # only used when a mood is given
+}
+
+
+# Raw (pre-scaling) value of every signal; unknown values become NaN
+def _raw_signals(columns):
+    def col(name):
+        return np.asarray(columns[name], dtype=np.float64)
+
+    year = col("Released_Year")
+    gross = col("Gross")
+    return {
+        "rating": col("IMDB_Rating"),
+        "votes": np.log1p(col("No_of_Votes")),
+        "meta": col("Meta_score"),
+        "gross": np.where(gross > 0, np.log1p(gross), np.nan),
+        "recency": np.where(year > 0, year, np.nan),
+    }
+
+
+def _scale(raw, stats):
+    matrix = np.empty((len(raw), len(next(iter(raw.values())))), dtype=np.float32)
+    for i, (name, values) in enumerate(raw.items()):
+        lo, hi, fill = stats[name]
+        scaled = (values - lo) / ((hi - lo) or 1)
+        matrix[i] = np.clip(np.where(np.isnan(scaled), fill, scaled), 0, 1)
+    return matrix
+
+
+# Precompute the signal matrix once at load. Unknown values get the signal's
+# mean, so a missing Metascore or gross neither helps nor hurts a movie.
+def build_signals(columns) -> Signals:
+    raw = _raw_signals(columns)
+    stats = {}
+    for name, values in raw.items():
+        known = values[~np.isnan(values)]
+        lo, hi = (known.min(), known.max()) if len(known) else (0.0, 1.0)
+        fill = ((known.mean() - lo) / ((hi - lo) or 1)) if len(known) else 0.0
+        stats[name] = (lo, hi, fill)
+    return Signals(list(raw), _scale(raw, stats), stats)
+
+
+# Scale rows appended to the catalog with the stats of the original load
+def extend_signals(signals: Signals, columns) -> Signals:
+    extra = _scale(_raw_signals(columns), signals.stats)
+    return signals._replace(matrix=np.concatenate([signals.matrix, extra], axis=1))
+
+
+# Top-n candidates by the weighted sum of signals (plus similarity to a seed
+# and closeness to the user's mood, both aligned with candidates), using
+# argpartition instead of a full sort.
+# Weights are read per call, so changing them never needs a reload.
+def rank(signals: Signals, weights: dict, candidates, similarity=None, top_n: int = 5, mood_match=None):
+    w = np.array([weights.get(name, 0.0) for name in signals.names], dtype=np.float32)
+    scores = w @ signals.matrix[:, candidates]
+    if similarity is not None:
+        scores += np.float32(weights.get("similarity", 0.0)) * similarity
+    if mood_match is not None:
+        scores += np.float32(weights.get("mood", 0.0)) * mood_match
+
+    if len(scores) > top_n:
+        top = np.argpartition(-scores, top_n - 1)[:top_n]
+    else:
+        top = np.arange(len(scores))
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return candidates[top], scores[top]
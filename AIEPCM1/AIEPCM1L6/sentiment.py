@@ -0,0 +1,38 @@
+import multiprocessing
+import os
+
+import numpy as np
+from textblob import TextBlob
+
+# Below this many texts a process pool costs more to start than it saves
+PARALLEL_THRESHOLD = 5000
+
+
+def _score_chunk(texts):
+    scores = np.empty((len(texts), 2), dtype=np.float32)
+    for i, text in enumerate(texts):
+        sentiment = TextBlob(text).sentiment
+        scores[i] = sentiment.polarity, sentiment.subjectivity
+    return scores
+
+
+# TextBlob polarity (-1..1) and subjectivity (0..1) of every text, as float32
+# arrays. Large inputs are split into chunks scored by a process pool; fork
+# is used where available so workers inherit the loaded TextBlob lexicon.
+def score_texts(texts, processes: int = None, chunk_size: int = 1000):
+    texts = ["" if text is None else str(text) for text in texts]
+    processes = processes or os.cpu_count() or 1
+    if len(texts) < PARALLEL_THRESHOLD or processes == 1:
+        scores = _score_chunk(texts)
+    else:
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        with multiprocessing.get_context(method).Pool(processes) as pool:
+            scores = np.concatenate(pool.map(_score_chunk, chunks))
+    return scores[:, 0], scores[:, 1]
+
+
+# How close each movie's tone is to the user's mood: 1 for the same polarity,
+# 0 for opposite ends of the -1..1 scale
+def mood_match(mood_polarity: float, polarity) -> np.ndarray:
+    return 1 - np.abs(np.float32(mood_polarity) - polarity) / 2
@@ -0,0 +1,194 @@
+import argparse
+import asyncio
+import bisect
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+# Importing the recommender loads the catalog and its indexes once for the process
+import AIMovieRecommendationSystem as app
+
+# Latency histogram buckets in milliseconds (the last bucket is open-ended)
+BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, float("inf")]
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS_MS)
+        self.total = 0
+        self.sum_ms = 0.0
+
+    def observe(self, seconds):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+
+    # Upper bound of the bucket holding the q-th quantile
+    def quantile(self, q):
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.counts):
+            seen += count
+            if self.total and seen >= q * self.total:
+                return bound
+        return None
+
+    def snapshot(self):
+        return {
+            "count": self.total,
+            "mean_ms": self.sum_ms / self.total if self.total else None,
+            "p50_ms": self.quantile(0.5),
+            "p99_ms": self.quantile(0.99),
+            "buckets": {("+Inf" if b == float("inf") else str(b)): c for b, c in zip(BUCKETS_MS, self.counts)},
+        }
+
+
+histograms = {}
+
+
+def _float(params, name):
+    value = params.get(name)
+    return float(value) if value else None
+
+
+# top_n must be 1..MAX_TOP_N; a ValueError becomes a 400
+MAX_TOP_N = 100
+
+
+def _top_n(params):
+    top_n = int(params.get("top_n", 5))
+    if not 1 <= top_n <= MAX_TOP_N:
+        raise ValueError(f"top_n must be between 1 and {MAX_TOP_N}")
+    return top_n
+
+
+def _records(recs):
+    return [
+        {"Series_Title": str(row.Series_Title), "Genre": str(row.Genre),
+         "IMDB_Rating": round(float(row.IMDB_Rating), 2),
+         **({"Similarity": round(float(row.Similarity), 4)} if hasattr(row, "Similarity") else {}),
+         **({"Score": round(float(row.Score), 4)} if hasattr(row, "Score") else {})}
+        for row in recs.itertuples()
+    ]
+
+
+# Route handlers run in the executor: they return (status, JSON body)
+def recommend(params):
+    recs = app.recommend_movies(genre=params.get("genre"), mood=params.get("mood"),
+                                rating=_float(params, "rating"), top_n=_top_n(params))
+    if isinstance(recs, str):
+        return 404, {"error": recs}
+    return 200, {"results": _records(recs)}
+
+
+def similar(params):
+    if not params.get("title"):
+        return 400, {"error": "Missing 'title' parameter."}
+    # Per-request field weights are passed as f_<field>=<value>, e.g. f_director=1
+    field_weights = {key[2:]: float(value) for key, value in params.items() if key.startswith("f_")}
+    recs = app.similar_to(params["title"], genre=params.get("genre"),
+                          min_rating=_float(params, "rating"), top_n=_top_n(params),
+                          field_weights=field_weights or None)
+    if isinstance(recs, str):
+        return 404, {"error": recs}
+    return 200, {"results": _records(recs)}
+
+
+# Per-request weights are passed as w_<signal>=<value>, e.g. w_votes=0.5
+def ranked(params):
+    weights = {key[2:]: float(value) for key, value in params.items() if key.startswith("w_")}
+    recs = app.rank_movies(genre=params.get("genre"), rating=_float(params, "rating"),
+                           seed_title=params.get("title"), weights=weights,
+                           top_n=_top_n(params), mood=params.get("mood"))
+    if isinstance(recs, str):
+        return 404, {"error": recs}
+    return 200, {"results": _records(recs)}
+
+
+ROUTES = {"/recommend": recommend, "/similar": similar, "/rank": ranked}
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+async def dispatch(method, target, executor):
+    url = urlsplit(target)
+    if method != "GET":
+        return 405, {"error": "Only GET is supported."}
+    if url.path == "/metrics":
+        return 200, {"latency": {path: h.snapshot() for path, h in histograms.items()},
+                     "recommend_cache": app.result_cache.stats()}
+    handler = ROUTES.get(url.path)
+    if handler is None:
+        return 404, {"error": f"Unknown path '{url.path}'."}
+
+    params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    start = time.perf_counter()
+    try:
+        status, body = await asyncio.get_running_loop().run_in_executor(executor, handler, params)
+    except ValueError as e:
+        status, body = 400, {"error": str(e)}
+    histograms.setdefault(url.path, LatencyHistogram()).observe(time.perf_counter() - start)
+    return status, body
+
+
+# Minimal HTTP/1.1 over asyncio streams, with keep-alive
+async def handle_connection(reader, writer, executor):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, target, version = request_line.decode("latin-1").split()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip()
+
+            try:
+                status, body = await dispatch(method, target, executor)
+            except Exception as e:
+                status, body = 500, {"error": f"{type(e).__name__}: {e}"}
+
+            keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+            payload = json.dumps(body).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + payload)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host, port, workers):
+    executor = ThreadPoolExecutor(max_workers=workers)
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(r, w, executor), host, port, backlog=1024)
+    print(f"Serving movie recommendations on http://{host}:{port} "
+          f"({len(app.titles)} titles, catalog {app.catalog_version})")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Movie recommendation HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=4, help="executor threads for scoring")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
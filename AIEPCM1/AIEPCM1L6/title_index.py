@@ -0,0 +1,147 @@
+import re
+import unicodedata
+from collections import namedtuple
+
+import numpy as np
+
+# Title lookup structures, built once with the catalog:
+#   exact     normalized title -> first row with that title
+#   postings  trigram -> sorted row ids of titles containing it
+#   sizes     number of distinct trigrams of every title
+#   sorted_titles / sorted_rows   normalized titles in sorted order, for prefix autocomplete
+TitleIndex = namedtuple("TitleIndex", ["exact", "postings", "sizes", "sorted_titles", "sorted_rows"])
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+# Lowercase, strip accents and punctuation, collapse whitespace:
+# "Amélie" -> "amelie", "Spider-Man: No Way Home" -> "spider man no way home"
+def normalize_title(title: str) -> str:
+    title = unicodedata.normalize("NFKD", str(title)).encode("ascii", "ignore").decode("ascii")
+    return _NON_WORD.sub(" ", title.lower()).strip()
+
+
+# Distinct character trigrams of a normalized title, padded so the first
+# letters and the end of the title get trigrams of their own
+def trigrams(normalized: str) -> set:
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def build_title_index(titles) -> TitleIndex:
+    exact, rows_by_gram = {}, {}
+    sizes = np.zeros(len(titles), dtype=np.int32)
+    normalized = []
+    for row, title in enumerate(titles):
+        norm = normalize_title(title)
+        normalized.append(norm)
+        exact.setdefault(norm, row)
+        grams = trigrams(norm)
+        sizes[row] = len(grams)
+        for gram in grams:
+            rows_by_gram.setdefault(gram, []).append(row)
+
+    postings = {gram: np.array(rows, dtype=np.int32) for gram, rows in rows_by_gram.items()}
+    normalized = np.array(normalized, dtype=str)
+    order = np.argsort(normalized, kind="stable").astype(np.int32)
+    return TitleIndex(exact, postings, sizes, normalized[order], order)
+
+
+def exact_match(index: TitleIndex, title: str):
+    return index.exact.get(normalize_title(title))
+
+
+# Fuzzy matches ranked by trigram Jaccard similarity (ties by catalog order).
+# Any title scoring >= min_score shares at least ceil(min_score * q) of the
+# query's q trigrams and has between min_score * q and q / min_score trigrams
+# itself, so only the q - that + 1 rarest postings generate candidates; the
+# longer postings are probed by binary search for the survivors, never scanned.
+def fuzzy_search(index: TitleIndex, query: str, top_n: int = 5, min_score: float = 0.3, active=None):
+    grams = trigrams(normalize_title(query))
+    q = len(grams)
+    empty = np.empty(0, dtype=np.int32)
+    lists = sorted((index.postings.get(gram, empty) for gram in grams), key=len)
+    min_overlap = max(int(np.ceil(min_score * q)), 1)
+    prefix, rest = lists[:q - min_overlap + 1], lists[q - min_overlap + 1:]
+    candidates, overlap = np.unique(np.concatenate(prefix), return_counts=True) if prefix else (empty, empty)
+
+    sizes = index.sizes[candidates]
+    keep = (overlap + len(rest) >= min_overlap) & (sizes >= min_score * q) & (sizes * min_score <= q)
+    if active is not None:
+        keep &= active[candidates]
+    candidates, overlap = candidates[keep], overlap[keep]
+    if len(candidates) == 0:
+        return empty, np.empty(0, dtype=np.float32)
+
+    for rows in rest:
+        pos = np.minimum(np.searchsorted(rows, candidates), len(rows) - 1)
+        overlap += rows[pos] == candidates
+    scores = (overlap / (q + index.sizes[candidates] - overlap)).astype(np.float32)
+
+    keep = scores >= min_score
+    candidates, scores = candidates[keep], scores[keep]
+    order = np.lexsort((candidates, -scores))[:top_n]
+    return candidates[order], scores[order]
+
+
+# Rows whose normalized title starts with the typed prefix, in title order
+def complete(index: TitleIndex, prefix: str, top_n: int = 5, active=None):
+    prefix = normalize_title(prefix)
+    start = np.searchsorted(index.sorted_titles, prefix, side="left")
+    stop = np.searchsorted(index.sorted_titles, prefix + "\x7f", side="left")
+    rows = index.sorted_rows[start:stop]
+    if active is not None:
+        rows = rows[active[rows]]
+    return rows[:top_n]
+
+
+# Exact hit first; otherwise the fuzzy matches, then prefix completions to fill up
+def suggest(index: TitleIndex, query: str, top_n: int = 5, active=None):
+    row = exact_match(index, query)
+    if row is not None and (active is None or active[row]):
+        return np.array([row], dtype=np.int32)
+    rows, _ = fuzzy_search(index, query, top_n, active=active)
+    if len(rows) < top_n:
+        extra = complete(index, query, top_n, active)
+        rows = np.concatenate([rows, extra[~np.isin(extra, rows)]])[:top_n]
+    return rows
+
+
+# Index rows appended to the catalog. New row ids are larger than every
+# existing one, so postings stay sorted by appending.
+def add_to_title_index(index: TitleIndex, rows, titles) -> TitleIndex:
+    rows = np.asarray(rows, dtype=np.int32)
+    sizes = np.concatenate([index.sizes, np.zeros(len(rows), dtype=np.int32)])
+    new_rows = {}
+    normalized = []
+    for row, title in zip(rows, titles):
+        norm = normalize_title(title)
+        normalized.append(norm)
+        index.exact.setdefault(norm, int(row))
+        grams = trigrams(norm)
+        sizes[row] = len(grams)
+        for gram in grams:
+            new_rows.setdefault(gram, []).append(row)
+
+    postings = dict(index.postings)
+    for gram, extra in new_rows.items():
+        old = postings.get(gram)
+        extra = np.array(extra, dtype=np.int32)
+        postings[gram] = extra if old is None else np.concatenate([old, extra])
+
+    normalized = np.array(normalized, dtype=str)
+    order = np.argsort(normalized, kind="stable")
+    at = np.searchsorted(index.sorted_titles, normalized[order], side="right")
+    sorted_titles = np.insert(index.sorted_titles.astype(object), at, normalized[order]).astype(str)
+    sorted_rows = np.insert(index.sorted_rows, at, rows[order])
+    return TitleIndex(index.exact, postings, sizes, sorted_titles, sorted_rows)
+
+
+# Forget the exact-title entries of removed rows; postings keep them and
+# searches filter them out with the caller's active mask
+def remove_from_title_index(index: TitleIndex, rows, titles) -> TitleIndex:
+    for row, title in zip(rows, titles):
+        norm = normalize_title(title)
+        if index.exact.get(norm) == row:
+            del index.exact[norm]
+    return index